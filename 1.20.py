@@ -1,4 +1,143 @@
 import math
+from dataclasses import dataclass
+from functools import partial
+
+
+@dataclass(slots=True, frozen=True)
+class ModelConstants:
+    # 热点路径常用的标量物理常数（属性直接读取，免去逐次字典查找）
+    # 由 define_constants 填充；self.constants 字典版本保留，供查看与输出
+    R: float      # 气体常数，J/(mol·K)
+    sigma: float  # 斯特藩-玻尔兹曼常数，W/(m²·K⁴)
+    T0: float     # 标准热力学温度，K
+    P0: float     # 标准大气压，Pa
+    Tref: float   # 参考温度，K
+
+
+def _dot(a, b):
+    # 点积内核：Σ a_i·b_i，按下标顺序累加（与逐项循环求和结果一致）
+    total = 0.0
+    for x, y in zip(a, b):
+        total += x * y
+    return total
+
+
+def _backward_diff(current, prev, delta_z):
+    # 后向差分内核：逐分量计算 (current_k - prev_k) / Δz，与公式23/29/31 的单项形式一致
+    return [(c - p) / delta_z for c, p in zip(current, prev)]
+
+
+def _advance_clamped(values, rates, dt, floor):
+    # 显式欧拉推进内核：原地执行 values_k ← max(values_k + rate_k·Δt, floor)，rates 与 values 按同一下标顺序排列
+    for k, rate in enumerate(rates):
+        values[k] = max(values[k] + rate * dt, floor)
+
+
+def _sensible_heat_step(T, Q_net, Cv, dt):
+    # 显热温度推进内核：体积热容 Cv > 1e-4 时 T ← T + Q_net·Δt / Cv，否则温度保持不变（气、固两相共用）
+    if Cv > 1e-4:
+        return T + Q_net * dt / Cv
+    return T
+
+
+def _phase_enthalpy(cp_coeffs, Hf, T0, T, C, V_delta):
+    # 单相焓内核：一次遍历同时得到一组组分的摩尔焓、摩尔数与总焓（公式5 + 公式50 + 公式57 + 公式4）
+    # 输入：cp_coeffs（各组分热容系数 (C0, C1, C2) 元组列表）、Hf（各组分标准生成焓列表）、T0（参考温度）、T（温度）、
+    #       C（各组分浓度），三者按组分顺序对应；V_delta（单段总体积）
+    # 输出：h（各组分摩尔焓 h_i = ΔHf,i + C0(T-T0) + 1/2 C1(T²-T0²) + 1/3 C2(T³-T0³)）、
+    #       n（各组分摩尔数 n_i = C_i·VΔ）、H（总焓 Σ n_i·h_i）
+    # 说明：温度差项与组分无关，每次调用只算一次，并预先乘上 1/2、1/3 系数，组分循环内只剩三项乘加
+    T_sq = T * T
+    T0_sq = T0 * T0
+    dT1 = T - T0
+    dT2_half = 0.5 * (T_sq - T0_sq)
+    dT3_third = (T_sq * T - T0_sq * T0) / 3.0
+    h = [0.0] * len(C)
+    n = [0.0] * len(C)
+    H = 0.0
+    for i, ((C0, C1, C2), Hf_i, C_i) in enumerate(zip(cp_coeffs, Hf, C)):
+        h_i = Hf_i + (C0 * dT1 + C1 * dT2_half + C2 * dT3_third)
+        n_i = C_i * V_delta
+        h[i] = h_i
+        n[i] = n_i
+        H += n_i * h_i
+    return h, n, H
+
+
+def _molar_heat_capacities(cp_coeffs, T):
+    # 摩尔热容内核：一次计算一组组分在温度 T 下的摩尔热容（公式6）
+    # 输入：cp_coeffs（各组分热容系数 (C0, C1, C2) 元组列表）、T（温度）
+    # 输出：各组分摩尔热容列表 cp,i = C0 + C1·T + C2·T²（按 Horner 形式 C0 + T·(C1 + C2·T) 求值）
+    return [C0 + T * (C1 + C2 * T) for C0, C1, C2 in cp_coeffs]
+
+
+def _gas_specific_heat(cp_coeffs_g, M_g, n_i, T):
+    # 气体比热容内核（公式6 + 公式81），只接收列表与标量，不依赖模型对象
+    # 输入：cp_coeffs_g（气体组分热容系数）、M_g（气体组分摩尔质量）、n_i（气体组分摩尔数，公式57_gas），三者按组分顺序对应；
+    #       T（气体温度）
+    # 输出：cp,g = Σ(ni·cp,i) / Σ(ni·Mi)
+    cp_i = _molar_heat_capacities(cp_coeffs_g, T)
+    numerator = _dot(n_i, cp_i)
+    denominator = _dot(n_i, M_g)
+    if denominator == 0:
+        return 0.0
+    return numerator / denominator
+
+
+def _reaction_heats(rates, dH, uses_Ts):
+    # 反应焓变内核（公式52）：按激活反应顺序一次累加，同时得到气相与固相（含气固）反应焓变
+    # 输入：rates（激活反应的速率）、dH（对应的反应焓变）、uses_Ts（是否按固体温度计算的标记），三者按激活反应顺序一一对应
+    # 输出：J_sg_g（气相反应焓变）、J_sg_s（固相及气固反应焓变）
+    # 公式：J_sg = Σ (r_j × ΔH_rj)
+    J_sg_g = 0.0
+    J_sg_s = 0.0
+    for rate, dH_j, on_solid in zip(rates, dH, uses_Ts):
+        if on_solid:
+            J_sg_s += rate * dH_j
+        else:
+            J_sg_g += rate * dH_j
+    return J_sg_g, J_sg_s
+
+
+def _reaction_rates(rxn_js, T_rxn, logT_rxn, P_comp, C, kr, n, EA_R, alpha1, alpha2, alpha3, beta2,
+                    reactant_idx, p_idx):
+    # 反应速率内核：一次计算一个单元内全部激活反应的速率
+    # 输入：rxn_js（激活反应下标）、T_rxn/logT_rxn（各反应对应温度及其对数）、P_comp/C（按组分顺序的分压/浓度列表）、
+    #       kr/n/EA_R/alpha1-3/beta2（按反应下标排列的速率系数，EA_R = EA/R）、reactant_idx（各反应的反应物组分下标）、
+    #       p_idx（第二反应物的分压组分下标，无分压项为 -1）
+    # 输出：各激活反应的速率列表
+    # 公式：r_j = kr·T^n·exp(-EA/(R·T))·∏P_i^β_i·∏C_i^α_i = kr·exp(n·lnT - (EA/R)/T)·∏P_i^β_i·∏C_i^α_i
+    rates = [0.0] * len(rxn_js)  # 速率为零的反应直接跳过，保持预置的 0.0
+    for pos, (j, T, logT) in enumerate(zip(rxn_js, T_rxn, logT_rxn)):
+        # 分压乘积项 ∏ P_i^β_i（beta2 对应第二个反应物的分压指数）
+        product_P = 1.0
+        k = p_idx[j]
+        if k >= 0:
+            product_P *= P_comp[k] ** beta2[j]
+        # 分压项为零时速率恒为零，跳过浓度项与 exp 计算
+        if product_P == 0.0:
+            continue
+        
+        # 浓度乘积项 ∏ C_i^α_i，按反应物从左到右匹配 alpha1/alpha2/alpha3
+        product_C = 1.0
+        alphas = (alpha1[j], alpha2[j], alpha3[j])
+        for m, c_k in enumerate(reactant_idx[j]):
+            product_C *= C[c_k] ** alphas[m]
+            if product_C == 0.0:
+                break
+        # 任一反应物浓度为零时速率恒为零
+        if product_C == 0.0:
+            continue
+        
+        # Arrhenius 项：T>0 时合并为一次 exp；非正温度（迭代发散时）保持原幂次写法，不取对数
+        if T > 0:
+            arrhenius = math.exp(n[j] * logT - EA_R[j] / T)
+        else:
+            arrhenius = (T ** n[j]) * math.exp(-EA_R[j] / T)
+        
+        rates[pos] = kr[j] * arrhenius * product_P * product_C
+    return rates
+
 
 class CementProductionModel:
     def __init__(self):
@@ -14,6 +153,7 @@ class CementProductionModel:
         self.convergence_threshold = 1e-4
         self.dt = 0.04  # 时间步长（平衡反应时间）
         self.dz = 1.0  # 空间步长
+        self._diffusion_pairs = {}  # 二元扩散系数中与温度、压力无关的组分对常量缓存
         
     def define_constants(self):
         # 定义固定常数
@@ -26,6 +166,15 @@ class CementProductionModel:
         self.constants['P0'] = 101325  # 标准大气压，Pa
         self.constants['Tref'] = 1200  # 参考温度，K
         
+        # 标量常数的属性版本，供逐单元计算直接读取
+        self.K = ModelConstants(
+            R=self.constants['R'],
+            sigma=self.constants['sigma'],
+            T0=self.constants['T0'],
+            P0=self.constants['P0'],
+            Tref=self.constants['Tref'],
+        )
+        
         # 反应焓变（单位：J/mol）
         self.constants['reaction_enthalpies'] = {
             'r1': 179170,  # CaCO3 → CaO + CO2 (吸热)
@@ -223,6 +372,22 @@ class CementProductionModel:
             'r11': {'kr': 3.1e6, 'n': 0, 'EA': 215 * 1000 , 'alpha1': 0, 'alpha2': 0, 'alpha3': 0, 'beta2': 0.4, 'unit': 's⁻¹'}
         }
         
+        # 反应速率系数按反应序号展开为平行列表（与化学计量矩阵列顺序一致），速率计算时按下标直接读取
+        rxn_items = list(self.constants['reaction_rate_coefficients'].items())
+        self._rxn_names = [rid for rid, _ in rxn_items]
+        self._rxn_index = {rid: j for j, rid in enumerate(self._rxn_names)}
+        self._kr = [coeff['kr'] for _, coeff in rxn_items]
+        self._EA_R = [coeff['EA'] / self.constants['R'] for _, coeff in rxn_items]  # EA/R，K
+        self._n = [coeff['n'] for _, coeff in rxn_items]
+        self._a1 = [coeff['alpha1'] for _, coeff in rxn_items]
+        self._a2 = [coeff['alpha2'] for _, coeff in rxn_items]
+        self._a3 = [coeff['alpha3'] for _, coeff in rxn_items]
+        self._b2 = [coeff['beta2'] for _, coeff in rxn_items]
+        # 各反应所用温度标记：固体反应 (r1-r5) 和气固反应 (r9-r11) 使用固体温度 Ts，气相燃烧反应 (r6-r8) 使用气体温度 Tg
+        self._rxn_uses_Ts = [rid not in ('r6', 'r7', 'r8') for rid in self._rxn_names]
+        # 反应焓变按反应下标排列（公式52），未定义焓变的反应取 0
+        self._rxn_dH = [self.constants['reaction_enthalpies'].get(rid, 0.0) for rid in self._rxn_names]
+        
         # 化学反应式
         self.constants['reactions'] = {
             'r1': {'name': 'CaCO3分解', 'equation': 'CaCO3 → CaO + CO2'},
@@ -263,6 +428,69 @@ class CementProductionModel:
                 [0,   0,  0,  0,  0,  0,  0,  0,  0,  0,  0],  # N2
             ]
         }
+        
+        # 组分顺序与下标映射：各单元浓度 C 以按此顺序排列的列表存储
+        self._components = tuple(self.constants['stoichiometric_matrix']['components'])
+        self._comp_idx = {comp: k for k, comp in enumerate(self._components)}
+        
+        # 各组分热容系数 (C0, C1, C2) 与标准生成焓，按组分下标排列（无数据的组分取 0）
+        cp_table = self.constants['molar_heat_capacity']
+        self._cp_coeffs = tuple(
+            (cp_table[c]['C0'], cp_table[c]['C1'], cp_table[c]['C2']) if c in cp_table else (0.0, 0.0, 0.0)
+            for c in self._components
+        )
+        self._Hf = tuple(self.constants['standard_enthalpy'].get(c, 0.0) for c in self._components)
+        # 固体（前 9 个）与气体（其余）两段，供摩尔焓内核直接使用
+        self._cp_coeffs_s, self._cp_coeffs_g = self._cp_coeffs[:9], self._cp_coeffs[9:]
+        self._Hf_s, self._Hf_g = self._Hf[:9], self._Hf[9:]
+        
+        # 各组分摩尔质量，按组分下标排列（固体取 solid_properties，气体及 C_sus 取 gas_properties）
+        solid_properties = self.constants['solid_properties']
+        gas_properties = self.constants['gas_properties']
+        self._molar_mass = tuple(
+            solid_properties[c]['molar_mass'] if c in solid_properties else gas_properties[c]['molar_mass']
+            for c in self._components
+        )
+        # 固体段与气体段（含 C_sus）摩尔质量，分别与浓度切片 C[:9]、C[9:] 一一对应
+        self._molar_mass_s, self._molar_mass_g = self._molar_mass[:9], self._molar_mass[9:]
+        # 固体体积（公式8）所用的摩尔质量、密度，悬浮碳 C_sus 计算体积时归为固体；
+        # 按组分顺序排列，与浓度切片 C[:10]（9 个固体组分 + 气体段首位的 C_sus）一一对应
+        volume_props = [solid_properties[c] for c in self._components[:9]] + [gas_properties['C_sus']]
+        self._solid_M = tuple(props['molar_mass'] for props in volume_props)
+        self._solid_rho = tuple(props['density'] for props in volume_props)
+        
+        # 各反应的反应物（按反应式从左到右，与 alpha1/alpha2/alpha3 一一对应）
+        self.constants['reaction_reactants'] = {
+            'r1': ('CaCO3',),  # CaCO3 → CaO + CO2
+            'r2': ('CaO', 'SiO2'),  # 2CaO + SiO2 → C2S
+            'r3': ('CaO', 'C2S'),  # CaO + C2S → C3S
+            'r4': ('CaO', 'Al2O3'),  # 3CaO + Al2O3 → C3A
+            'r5': ('CaO', 'Al2O3', 'Fe2O3'),  # 4CaO + Al2O3 + Fe2O3 → C4AF
+            'r6': ('CO', 'O2'),  # 2CO + O2 → 2CO2
+            'r7': ('CO', 'H2O'),  # CO + H2O → CO2 + H2
+            'r8': ('H2', 'O2'),  # 2H2 + O2 → 2H2O
+            'r9': ('C_sus', 'O2'),  # 2C + O2 → 2CO
+            'r10': ('C_sus', 'H2O'),  # C + H2O → CO + H2
+            'r11': ('C_sus', 'CO2')  # C + CO2 → 2CO
+        }
+        # 化学计量矩阵各组分行的非零系数 (列下标, 系数)，列顺序与反应下标一致
+        self._stoich_nonzero = [
+            tuple((j, coeff) for j, coeff in enumerate(row) if coeff != 0)
+            for row in self.constants['stoichiometric_matrix']['matrix']
+        ]
+        
+        # 参与速率分压项的气体组分
+        self._pp_components = ('H2O', 'CO2')
+        self._pp_idx = tuple(self._comp_idx[c] for c in self._pp_components)
+        
+        # 反应物组分下标表（速率内核使用），按反应下标排列
+        reactants = self.constants['reaction_reactants']
+        self._rxn_reactant_idx = [tuple(self._comp_idx[c] for c in reactants[rid]) for rid in self._rxn_names]
+        # 第二反应物若为分压组分，记录其组分下标，否则为 -1
+        self._rxn_p_idx = [
+            self._comp_idx[reactants[rid][1]] if len(reactants[rid]) > 1 and reactants[rid][1] in self._pp_components else -1
+            for rid in self._rxn_names
+        ]
     
     def define_parameters(self):
         # 定义系统参数
@@ -301,6 +529,32 @@ class CementProductionModel:
         self.parameters['equipment']['preheater']['dz'] = self.parameters['equipment']['preheater']['length'] / self.parameters['equipment']['preheater']['segments']
         self.parameters['equipment']['calciner']['dz'] = self.parameters['equipment']['calciner']['length'] / self.parameters['equipment']['calciner']['segments']
         self.parameters['equipment']['kiln']['dz'] = self.parameters['equipment']['kiln']['length'] / self.parameters['equipment']['kiln']['segments']
+        
+        # WSGG 温度相关系数 cj,i 只取决于固定的 H2O/CO2 比值，预先算好（公式48）
+        self._wsgg_cj_i = self.formula_48()
+        # WSGG 吸收系数 kj 同理只取决于该比值（公式47）
+        self._wsgg_k_j = self.formula_47()
+        # 填充率 η → 填充角 θ 查表，作为牛顿迭代的初值（见 _calculate_fill_angle）
+        self._fill_angle_lut = self._build_fill_angle_lut()
+        
+        # 求解过程中不变的常量与组分列表，预先取出
+        self._cache_constants()
+    
+    def _cache_constants(self):
+        # 缓存求解过程中保持不变的常量、参数与组分列表
+        # 输入：self.constants、self.parameters（须在 define_constants / define_parameters 之后调用）
+        # 输出：self._solid_components / _gas_components / _real_gas_components（组分名称元组）、
+        #       self._mu_g、self._epsilon_s、self._d_p
+        # 说明：逐单元计算中直接读取这些属性，避免每个单元、每个时间步重复做嵌套字典查找与列表切片
+        components = self._components
+        self._solid_components = components[:9]
+        self._gas_components = components[9:]
+        # 真实气体组分（不含悬浮碳 C_sus），与浓度切片 C[10:] 一一对应
+        self._real_gas_components = tuple(c for c in self._gas_components if c != 'C_sus')
+        
+        self._mu_g = self.parameters['mu_g']  # 气体平均粘度
+        self._epsilon_s = self.parameters.get('epsilon_s', 0.9)  # 固体发射率
+        self._d_p = self.constants.get('d_p', 3e-5)  # 颗粒直径
     
     def define_control_variables(self):
         # 定义控制量：连续进料导入预热器入口
@@ -389,6 +643,38 @@ class CementProductionModel:
             'gas_concentration_constant': False,  # 气相浓度变化
             
         }
+        
+        # 各设备几何常量一次性预计算，迭代过程中直接读取
+        self._cache_geometry()
+    
+    def _cache_geometry(self):
+        # 预计算各设备的几何与三角函数常量
+        # 输入：设备参数（半径、倾角）、控制变量（窑转速）
+        # 输出：self._geom[device] = {r_c, two_rc, A_t, V_delta}；回转窑额外包含 psi、omega、sin_xi、cos_xi
+        # 说明：半径、倾角、转速在求解过程中保持不变，公式12（休止角）和公式17（截面积）只需算一次，
+        #       避免在逐单元循环中重复计算；公式13、公式36 的窑转速与公式13 的休止角正余弦都取自这里的同一份快照，
+        #       若修改了 omega 或设备参数，需重新调用本函数刷新
+        self._geom = {}
+        for device, equipment in self.parameters['equipment'].items():
+            r_c = equipment['radius']
+            A_t = self.formula_17(r_c)  # 总横截面积（公式17）
+            self._geom[device] = {
+                'r_c': r_c,
+                'two_rc': 2 * r_c,
+                'A_t': A_t,
+                'V_delta': self.formula_58(A_t, equipment['dz']),  # 单段总体积（公式58），同一设备各段相同
+            }
+        
+        # 回转窑：倾角与休止角（公式12）的三角函数
+        kiln_geom = self._geom['kiln']
+        kiln_geom['psi'] = self.parameters['equipment']['kiln']['angle']
+        omega = self.control_variables.get('omega')
+        kiln_geom['omega'] = omega  # 窑转速，与 sin_xi、cos_xi 同步保存
+        a_omega = self.parameters.get('a_omega', 0.05)
+        b_omega = self.parameters.get('b_omega', 0.6)
+        xi = self.formula_12(a_omega, b_omega, omega)
+        kiln_geom['sin_xi'] = math.sin(xi)
+        kiln_geom['cos_xi'] = math.cos(xi)
     
     def spatial_discretization(self):
         # 有限体积空间离散
@@ -407,7 +693,7 @@ class CementProductionModel:
         self.variables = { #状态变量子字典，存储需要动态求解的变量
             # 状态变量 (向量形式：x=[C, U^]^T)
             'state_variables': {
-                'C': [],  # 各相组分浓度向量，每个元素包含该段的所有组分浓度
+                'C': [],  # 各相组分浓度向量，每个元素为该段按组分顺序排列的浓度列表
                 # 【新增】分别存储气固内能，供分相温度求解器使用
                 'U_g': [], 
                 'U_s': []
@@ -427,17 +713,18 @@ class CementProductionModel:
         }
         
         # 获取所有组分名称
-        #从化学计量矩阵中获取所有组分名称，用于后续初始化各单元的浓度字典
+        #从化学计量矩阵中获取所有组分名称，用于后续初始化各单元的浓度列表
         components = self.constants['stoichiometric_matrix']['components']
+        comp_idx = self._comp_idx
         solid_comps = components[:9]
         gas_comps = components[9:]
 
         # 1. 定义初始化基础热力学条件
         feed_gas_temp = self.control_variables['gas_feed']['temperature'] # 使用气体进料温度 
         feed_solid_temp = self.control_variables['solid_feed']['temperature'] # 使用固体进料温度 
-        P_init = self.constants['P0']
-        T0 = self.constants['T0']
-        R = self.constants['R']
+        P_init = self.K.P0
+        T0 = self.K.T0
+        R = self.K.R
         # 2. 获取进料组分与流率参数 (生料 + 气体 + 燃料)
         solid_feed = self.control_variables['solid_feed']
         gas_feed = self.control_variables['gas_feed']
@@ -450,23 +737,54 @@ class CementProductionModel:
         v_s_ref = preheater_config.get('solid_velocity', 0.4) 
         
         # B. 获取气相速度
-        radius_pre = self.parameters['equipment']['preheater']['radius']
-        A_pre = self.formula_17(radius_pre)
+        A_pre = self._geom['preheater']['A_t']  # 预热器截面积 (公式17，预计算)
         n_dot_inlet = gas_feed['total_rate']
         v_g_ref = (n_dot_inlet * R * feed_gas_temp) / (P_init * A_pre)
 
         self.control_variables['gas_feed']['initial_velocity'] = v_g_ref
 
-        # 初始化每个分段的变量
-        for i in range(total_segments):
-            # 确定设备类型
-            if i < preheater_segments:
-                device = 'preheater'
-            elif i < preheater_segments + calciner_segments:
-                device = 'calciner'
-            else:
-                device = 'kiln'
-            
+        # 各分段所属设备类型（沿物料流动方向：预热器→分解炉→回转窑）
+        device_types = (['preheater'] * preheater_segments
+                        + ['calciner'] * calciner_segments
+                        + ['kiln'] * kiln_segments)
+        
+        # 初始化单元列表，每个单元对应一个分段
+        self.cells = []
+        
+        # 各区段差异化配置（附带设备类型），同一区段的单元共用同一份
+        section_config_by_device = {}
+        for device in self.section_configs:
+            section_config = dict(self.section_configs[device])
+            section_config['device_type'] = device
+            section_config_by_device[device] = section_config
+        
+        # 各区段完整执行规则（通用规则 + 差异化配置）只取决于区段，预先生成一次，求解时直接读取
+        self._execution_rules_by_section = {
+            device: self._get_execution_rules(section_config)
+            for device, section_config in section_config_by_device.items()
+        }
+        # 各区段激活的反应速率系数表同样只取决于区段，预先筛选一次
+        self._active_reactions_by_section = {
+            device: self._select_active_reactions(device, rules)
+            for device, rules in self._execution_rules_by_section.items()
+        }
+        # 激活反应换算为反应下标（平行列表下标）元组，求解时速率内核直接按下标取系数，不再逐单元查反应标识
+        self._active_rxn_js_by_section = {
+            device: tuple(self._rxn_index[reaction_id] for reaction_id in active_reactions)
+            for device, active_reactions in self._active_reactions_by_section.items()
+        }
+        # 与激活反应下标一一对应的反应焓变及温度标记，反应焓变内核按位置直接读取
+        self._active_rxn_dH_by_section = {
+            device: tuple(self._rxn_dH[j] for j in rxn_js)
+            for device, rxn_js in self._active_rxn_js_by_section.items()
+        }
+        self._active_rxn_uses_Ts_by_section = {
+            device: tuple(self._rxn_uses_Ts[j] for j in rxn_js)
+            for device, rxn_js in self._active_rxn_js_by_section.items()
+        }
+        
+        # 初始化每个分段的变量，并同步构建对应的单元字典
+        for i, device in enumerate(device_types):
             # 根据设备给予不同的初始温度
             if device == 'preheater':
                 # 预热器：维持进料温度
@@ -496,23 +814,17 @@ class CementProductionModel:
                 # 预热器：保持进料速度
                 v_s_local = v_s_ref
 
-            # 获取当前段的空间步长
-            if device == 'preheater':
-                 dz = self.parameters['equipment']['preheater']['dz']
-            elif device == 'calciner':
-                 dz = self.parameters['equipment']['calciner']['dz']
-            else:
-                 dz = self.parameters['equipment']['kiln']['dz']
+            # 获取当前段的空间步长（设备长度 / 分段数）
+            dz = self.parameters['equipment'][device]['dz']
             
-            # 获取设备半径并计算截面积 (公式17)
-            radius = self.parameters['equipment'][device]['radius']
-            A_t = self.formula_17(radius)
+            # 获取设备截面积 (公式17，预计算)
+            A_t = self._geom[device]['A_t']
             
             # 计算单段总体积 (公式58)
             V_delta = self.formula_58(A_t, dz)
 
-            # 初始化状态变量 C (浓度)
-            segment_C = {}
+            # 初始化状态变量 C (浓度)，按组分顺序存储为列表
+            segment_C = [0.0] * len(components)
 
             # --- 气体组分初始化 ---
             for component in components:
@@ -533,9 +845,9 @@ class CementProductionModel:
                         n_resident_i = n_dot_i * (dz / v_g_local)
                         # 计算浓度
                         conc = self.formula_59(V_delta, n_resident_i)
-                        segment_C[component] = conc
+                        segment_C[comp_idx[component]] = conc
                     else:
-                        segment_C[component] = 1e-12
+                        segment_C[comp_idx[component]] = 1e-12
                 elif component in gas_comps:
                     # A. 基础气体进料
                     # 获取摩尔分数 
@@ -570,7 +882,7 @@ class CementProductionModel:
                     else:
                         conc = self.formula_60(1e-12, P_init, current_gas_temp, R)
 
-                    segment_C[component] = conc
+                    segment_C[comp_idx[component]] = conc
                 
                 # --- 固体组分初始化  ---
                 elif component in solid_comps:
@@ -623,9 +935,9 @@ class CementProductionModel:
                         # 7. 使用公式59计算摩尔浓度 (mol/m³)
                         # C = n / V
                         conc = self.formula_59(V_delta, n_resident_i)
-                        segment_C[component] = conc
+                        segment_C[comp_idx[component]] = conc
                     else:
-                        segment_C[component] = 1e-12
+                        segment_C[comp_idx[component]] = 1e-12
             
             self.variables['state_variables']['C'].append(segment_C)
             
@@ -635,15 +947,11 @@ class CementProductionModel:
             n_s_list = []       # 驻留摩尔数列表 (用于计算总焓)
             int_h_s_list = []   # 积分焓列表
             
-            # 辅助字典用于体积计算
-            solid_moles_dict = {} 
-            
             for comp in solid_comps:
-                conc = segment_C.get(comp, 0.0)
+                conc = segment_C[comp_idx[comp]]
                 # 反向计算驻留摩尔数: n = C * V_delta (调用formula_57)
                 n_i = self.formula_57(V_delta, conc)
                 n_s_list.append(n_i)
-                solid_moles_dict[comp] = n_i 
                 
                 # 获取标准生成焓
                 Hf = self.constants['standard_enthalpy'].get(comp, 0.0)
@@ -661,19 +969,11 @@ class CementProductionModel:
             Hf_g_list = []
             n_g_list = []
             int_h_g_list = []
-            gas_moles_dict = {}
             
             for comp in gas_comps:
-                conc = segment_C.get(comp, 0.0)
+                conc = segment_C[comp_idx[comp]]
                 n_i = self.formula_57_gas(V_delta, conc)
                 n_g_list.append(n_i)
-                # 体积计算分类逻辑
-                if comp == 'C_sus':
-                    # 悬浮碳虽然在气体组分列表中(gas_comps)，但在计算体积时归为固体
-                    solid_moles_dict[comp] = n_i
-                else:
-                    # 真实气体分子，用于计算气体体积
-                    gas_moles_dict[comp] = n_i 
                 
                 Hf = self.constants['standard_enthalpy'].get(comp, 0.0)
                 Hf_g_list.append(Hf)
@@ -694,23 +994,13 @@ class CementProductionModel:
             H_hat_g = self.formula_64(H_total_g, V_delta)
             
             # 5. 计算体积和体积分数 (用于内能计算中的PV项)
-            # 准备公式8需要的参数字典
-            solid_M = {c: self.constants['solid_properties'][c]['molar_mass'] for c in solid_comps if c in self.constants['solid_properties']}
-            solid_rho = {c: self.constants['solid_properties'][c]['density'] for c in solid_comps if c in self.constants['solid_properties']}
-            
-            #  C_sus 的物理属性
-            if 'C_sus' in solid_moles_dict:
-                 # 从 gas_properties 获取
-                 if 'C_sus' in self.constants['gas_properties']:
-                     props = self.constants['gas_properties']['C_sus']
-                     solid_M['C_sus'] = props['molar_mass']
-                     solid_rho['C_sus'] = props['density']
-
+            # 悬浮碳 C_sus（气体段首位）虽然在气体组分列表中，但在计算体积时归为固体
+            # 固体摩尔质量、密度（含 C_sus 的物理属性，见 define_constants）按同一顺序排列
             # 计算固体体积 (公式8)
-            V_s = self.formula_8(solid_M, solid_rho, solid_moles_dict)
+            V_s = self.formula_8(self._solid_M, self._solid_rho, n_s_list + n_g_list[:1])
             
-            # 计算气体体积 (公式7)
-            V_g = self.formula_7(R, current_gas_temp, P_init, gas_moles_dict)
+            # 计算气体体积 (公式7)，只计真实气体分子
+            V_g = self.formula_7(R, current_gas_temp, P_init, n_g_list[1:])
             
             # 计算体积分数 (公式66, 67)
             V_s_fraction = self.formula_66(V_s, V_delta)
@@ -742,43 +1032,40 @@ class CementProductionModel:
             self.variables['algebraic_variables']['Ts'].append(current_solid_temp)
             
             # P: 系统压力向量初始化
-            self.variables['algebraic_variables']['P'].append(self.constants['P0'])
+            self.variables['algebraic_variables']['P'].append(self.K.P0)
             
             # 记录设备类型
             self.variables['device_type'].append(device)
-        
-        # 初始化单元列表，每个单元对应一个分段
-        self.cells = []
-        for i in range(total_segments): #再次遍历所有离散单元，构建单元字典并添加到cells列表
-            # 计算每个单元的delta_z
-            if i < preheater_segments:
-                # 预热器：长1.3m，分为3段
-                delta_z = 1.5 / preheater_segments
-            elif i < preheater_segments + calciner_segments:
-                # 分解炉：长4m，分为4段
-                delta_z = 4.0 / calciner_segments
-            else:
-                # 回转窑：长2.5m，分为5段
-                delta_z = 2.5 / kiln_segments
             
+            # 构建单元字典，引用刚写入全局数组的当前段变量
             cell = {
                 'index': i, #存储单元索引（从 0 开始）
-                'device_type': self.variables['device_type'][i], #存储单元的设备类型
-                'delta_z': delta_z,
+                'device_type': device, #存储单元的设备类型
+                '_section': device, #单元所属工艺区段（求解循环直接读取）
+                'delta_z': dz,
                 'state_variables': { #单元的状态变量子字典
-                    'C': self.variables['state_variables']['C'][i], #引用全局C列表中当前单元的浓度字典
-                    'U_g': self.variables['state_variables']['U_g'][i],
-                    'U_s': self.variables['state_variables']['U_s'][i]
+                    'C': segment_C, #引用全局C列表中当前单元的浓度列表（按组分顺序）
+                    'U_g': U_g_init,
+                    'U_s': U_s_init
                 },
                 'algebraic_variables': { #单元的代数变量子字典
-                    'Tg': self.variables['algebraic_variables']['Tg'][i],
-                    'Ts': self.variables['algebraic_variables']['Ts'][i],
-                    'P': self.variables['algebraic_variables']['P'][i],
-                    'U_hat': self.variables['algebraic_variables']['U_hat'][i]
+                    'Tg': current_gas_temp,
+                    'Ts': current_solid_temp,
+                    'P': self.K.P0,
+                    'U_hat': U_g_init + U_s_init
                 }
             }
             self.cells.append(cell) #将当前单元字典添加到cells列表中
         
+        # 按区段分组的连续单元索引范围 (区段, 起始索引, 结束索引)，沿物料流动方向排列
+        self._section_ranges = []
+        start = 0
+        for device, segments in (('preheater', preheater_segments),
+                                 ('calciner', calciner_segments),
+                                 ('kiln', kiln_segments)):
+            self._section_ranges.append((device, start, start + segments))
+            start += segments
+        
         print(f"空间离散完成：{total_segments} 个单元，其中预热器 {preheater_segments} 个，分解炉 {calciner_segments} 个，回转窑 {kiln_segments} 个")
     
     # 通用计算子函数库 
@@ -806,45 +1093,44 @@ class CementProductionModel:
         # 输入：Hf,i（标准生成焓，常数）、ni（各组分摩尔数列表，变量，公式57输出）、integral_enthalpy（各组分积分焓列表，公式5输出）
         # 输出：H（气体或固体的总焓）
         # 公式：H(T,P,n) = Σ n_i (ΔHf,i + ∫T0到T cp,i(τ)dτ)
-        total_enthalpy = 0.0
-        for hf, n, integral in zip(Hf_i, n_i, integral_enthalpy):
-            total_enthalpy += n * (hf + integral)
-        return total_enthalpy
+        # 先合并各组分摩尔焓 ΔHf,i + ∫cp,i dτ，再与摩尔数做一次点积
+        h_i = [hf + integral for hf, integral in zip(Hf_i, integral_enthalpy)]
+        return _dot(n_i, h_i)
     
     def formula_5(self, C0, C1, C2, T0, T):
         # 5组分i积分焓
         # 输入：C0,C1,C2（单个组分i的热容系数，常数）、T0（常数）、T（温度，变量）
         # 输出：单个组分i的摩尔热容积分值
         # 公式：∫T0到T cp,i(τ)dτ = C0(T-T0) + 1/2 C1(T²-T0²) + 1/3 C2(T³-T0³)
-        return C0 * (T - T0) + 0.5 * C1 * (T**2 - T0**2) + (1/3) * C2 * (T**3 - T0**3)
+        T_sq = T * T
+        T0_sq = T0 * T0
+        return C0 * (T - T0) + 0.5 * C1 * (T_sq - T0_sq) + C2 * (T_sq * T - T0_sq * T0) / 3.0
     
     def formula_6(self, C0, C1, C2, T):
         # 6摩尔热容
         # 输入：C0,C1,C2（组分i的热容系数，常数）、T（温度，变量）
         # 输出：cp,i（组分i的摩尔热容）
-        return C0 + C1 * T + C2 * T**2
+        # 公式：cp,i = C0 + C1·T + C2·T²，按 Horner 形式 C0 + T·(C1 + C2·T) 求值
+        # 说明：各组分摩尔热容由模块内核 _molar_heat_capacities 整组计算
+        return C0 + T * (C1 + C2 * T)
     
     def formula_7(self, R, T, P, n_i):
         # 7气体体积计算
-        # 输入：R（气体常数，常数）、T（温度，变量）、P（压力，变量）、n_i（各组分摩尔数字典,公式57输出）
+        # 输入：R（气体常数，常数）、T（温度，变量）、P（压力，变量）、n_i（各组分摩尔数列表,公式57输出）
         # 输出：Vg（气体体积）
         # 公式：V_g = (RT/P) * Σn_i
-        total_moles = sum(n_i.values())
+        total_moles = sum(n_i)
         return (R * T / P) * total_moles
     
     def formula_8(self, M_i, rho_i, n_i):
         # 8固体体积计算
-        # 输入：M_i（摩尔质量字典）、rho_i（密度字典）、n_i（摩尔数字典）
+        # 输入：M_i（摩尔质量列表）、rho_i（密度列表）、n_i（摩尔数列表），三者按同一组分顺序排列
         # 输出：Vs（固体体积）
         # 公式：V_s = Σ (n_i * M_i / ρ_i)
         total_volume = 0.0
-        # 直接遍历摩尔数字典进行累加
-        for comp, n in n_i.items():
-            # 确保该组分在属性字典中存在且密度有效
-            if comp in M_i and comp in rho_i:
-                rho = rho_i[comp]
-                # V = (n * M) / rho
-                total_volume += (n * M_i[comp]) / rho
+        for n, M, rho in zip(n_i, M_i, rho_i):
+            # V = (n * M) / rho
+            total_volume += (n * M) / rho
                     
         return total_volume
     
@@ -867,22 +1153,12 @@ class CementProductionModel:
         vg = inner_term ** (1/6)
         return vg
     
-    def formula_11(self, gas_properties, C_i_g):
+    def formula_11(self, M_i_g, C_i_g):
         # 11气体密度计算
-        # 输入：gas_properties（气体属性字典，包含摩尔质量，常数）、Ci,g（组分i气体组分浓度，变量）
+        # 输入：Mi,g（气体组分摩尔质量列表，常数）、Ci,g（气体组分浓度列表，变量），两者按组分顺序一一对应
         # 输出：ρg（气体密度）
         # 公式：ρi = Σ M_i * C_i
-        total_density = 0.0
-        
-        # 遍历传入的浓度字典
-        for component, concentration in C_i_g.items():
-            # 确保该组分存在于气体属性字典中
-            if component in gas_properties:
-                # 直接读取嵌套字典中的 molar_mass
-                molar_mass = gas_properties[component]['molar_mass']
-                total_density += concentration * molar_mass
-            
-        return total_density 
+        return _dot(C_i_g, M_i_g)
     
     def formula_12(self, a_omega, b_omega, omega):
         # 12休止角计算
@@ -890,19 +1166,21 @@ class CementProductionModel:
         # 输出：ξ（休止角）
         return a_omega * omega + b_omega
     
-    def formula_13(self, omega, psi, xi, r_c, Lc, phi_z):
+    def formula_13(self, omega, psi, sin_xi, cos_xi, two_rc, Lc, phi_z):
         # 13回转窑固体速度
-        # 输入：ω（窑转速，控制量）、ψ（窑倾角）、ξ（公式10输出）、rc（窑内半径，参数）、Lc（弦长，公式14输出）、ϕ(z)（床层坡度角，公式73输出）
+        # 输入：ω（窑转速，控制量）、ψ（窑倾角）、sinξ/cosξ（休止角ξ的正余弦，公式12输出，预计算于 _geom）、2rc（窑内直径，参数）、Lc（弦长，公式14输出）、ϕ(z)（床层坡度角，公式73输出）
         # 输出：vs（固体速度）
         # 公式：vs = ω * (ψ + phi_z * cos(xi)) / sin(xi) * (2*rc / sin(Lc/(2*rc)))
-        return omega * ((psi + phi_z * math.cos(xi)) / math.sin(xi)) * ((2 * r_c / math.sin(Lc / (2 * r_c))))
+        return omega * ((psi + phi_z * cos_xi) / sin_xi) * ((two_rc / math.sin(Lc / two_rc)))
     
-    def formula_14(self, r_c, theta_z):
+    def formula_14(self, r_c, theta_z, sin_half_theta=None):
         # 14弦长
-        # 输入：rc（参数）、θ(z)（填充角，公式18输出）
+        # 输入：rc（参数）、θ(z)（填充角，公式18输出）、sin(θ/2)（可选，已算好时直接复用）
         # 输出：Lc（弦长）
         # 公式：Lc = 2 * r_c * math.sin(theta_z / 2)
-        return 2 * r_c * math.sin(theta_z / 2)
+        if sin_half_theta is None:
+            sin_half_theta = math.sin(theta_z / 2)
+        return 2 * r_c * sin_half_theta
     
     def formula_15(self, n_list, cp_mol_list, M_list):
         # 15 固体质量比热容
@@ -941,6 +1219,28 @@ class CementProductionModel:
         # 公式：η = A_s / A_t
         return A_s / A_t
     
+    def _build_fill_angle_lut(self, points=101):
+        # 辅助函数：构建填充角 θ 关于 u = (2η)**(1/3) 的等距网格表（η ∈ [0, 0.5]）
+        # 输入：points（网格点数）
+        # 输出：θ 值列表，第 k 个元素对应 η = (k/(points-1))**3 / 2
+        # 说明：小填充率时 θ ≈ (12πη)**(1/3)，按 η 的立方根取网格可使 θ 近似线性，插值初值更准；
+        #       η > 0.5 的一半由对称关系 θ(η) = 2π - θ(1-η) 得到，不另建表；
+        #       表中各点以 π 为初值、较严容差做牛顿迭代一次性求出，仅在初始化时计算
+        lut = []
+        for k in range(points):
+            target = math.pi * (k / (points - 1))**3
+            theta = math.pi
+            for _ in range(50):
+                df_val = 1 - math.cos(theta)
+                if abs(df_val) < 1e-12:
+                    break
+                delta = (theta - math.sin(theta) - target) / df_val
+                theta -= delta
+                if abs(delta) < 1e-12:
+                    break
+            lut.append(theta)
+        return lut
+    
     def _calculate_fill_angle(self, eta):
         # 辅助函数：使用牛顿迭代法求解填充角
         # 输入：As（固体横截面积）、At（窑总横截面积）、η（填充因子）
@@ -950,8 +1250,18 @@ class CementProductionModel:
         # 定义函数 f(θ) = (θ - sinθ)/(2π) - η = 0
         # 导数 f'(θ) = (1 - cosθ)/(2π)
         
-        # 初始猜测值
-        theta = math.pi  # 初始猜测为180度
+        # 初始猜测值：η 在 (0, 1) 内时查 θ 表线性插值得到（η > 0.5 按对称关系取值），通常 1~2 步即收敛；
+        # 表外（η ≤ 0 或 η ≥ 1）仍从 180 度开始
+        lut = self._fill_angle_lut
+        if 0 < eta < 1:
+            eta_half = eta if eta <= 0.5 else 1 - eta
+            x = (2 * eta_half)**(1/3) * (len(lut) - 1)
+            k = min(int(x), len(lut) - 2)
+            theta = lut[k] + (lut[k + 1] - lut[k]) * (x - k)
+            if eta > 0.5:
+                theta = 2 * math.pi - theta
+        else:
+            theta = math.pi
         tolerance = 1e-6  # 收敛容差
         max_iter = 20  # 最大迭代次数
         
@@ -989,45 +1299,25 @@ class CementProductionModel:
         # 公式：kg = 0.024 + 4.6 * 1e-5*T
         return 0.024 + 4.6 * 1e-5 * T
     
-    def formula_21(self, vg, C_i_g, Tg, P, components, xj, dC_i_g_dz, i):
+    def formula_21(self, vg, C_i_g, Tg, P, components, xj, dC_i_g_dz, i, D_ij=None):
         # 21气体组分i物质通量
-        # 输入：vg（公式10输出）、Ci,g（组分i气体组分浓度，变量）、Tg（气体温度）、P（压力）、components（组分列表）、xj（各组分摩尔分数）、cg（气体总摩尔浓度）、∂zCi,g（组分i浓度梯度，公式23输入）、i（当前计算的组分索引）
+        # 输入：vg（公式10输出）、Ci,g（组分i气体组分浓度，变量）、Tg（气体温度）、P（压力）、components（组分列表）、xj（各组分摩尔分数）、cg（气体总摩尔浓度）、∂zCi,g（组分i浓度梯度，公式23输入）、i（当前计算的组分索引）、D_ij（可选，本单元已算好的二元扩散系数矩阵）
         # 输出：Ni,g（气体组分i物质通量）
         # 公式：N_i,g = v_g * C_i,g - D_i,g * ∂_z C_i,g
         # 计算有效扩散系数：输入(气体温度, 压力, 组分列表, 摩尔分数列表, 总摩尔浓度, 组分索引)，输出(气体有效扩散系数)
-        D_i_g = self.formula_22(Tg, P, components, xj, i)
+        D_i_g = self.formula_22(Tg, P, components, xj, i, D_ij)
         return vg * C_i_g - D_i_g * dC_i_g_dz
     
-    def formula_22(self, T, P, components, xj, i):
+    def formula_22(self, T, P, components, xj, i, D_ij=None):
         # 22气体有效扩散系数
-        # 输入：T（温度，变量）、P（压力，变量）、components（组分列表）、xj（各组分摩尔分数列表，公式61输出）、cg（气体总摩尔浓度，变量，公式77输出）、i（当前计算的组分索引）
+        # 输入：T（温度，变量）、P（压力，变量）、components（组分列表）、xj（各组分摩尔分数列表，公式61输出）、cg（气体总摩尔浓度，变量，公式77输出）、i（当前计算的组分索引）、D_ij（可选，二元扩散系数矩阵，公式24矩阵形式输出）
         # 输出：Di,g（气体有效扩散系数）
         # 公式：D_i,g = (Σ_{j≠i} x_j / (c_g D_ij))^(-1)
         sum_term = 0.0
         
-        # 计算二元扩散系数矩阵
-                # 初始化 N*N 矩阵，默认值为 0.0
-        num_comps = len(components)
-        D_ij = [[0.0] * num_comps for _ in range(num_comps)]
-
-        # 仅遍历矩阵的上三角部分 (idx_b > idx_a)，利用 D_ab = D_ba 填充
-        for idx_a in range(num_comps):
-            for idx_b in range(idx_a + 1, num_comps):
-                comp_a = components[idx_a]
-                comp_b = components[idx_b]
-                
-                # 获取组分a和b的摩尔质量和扩散体积
-                M_a = self.constants['gas_properties'][comp_a]['molar_mass']
-                M_b = self.constants['gas_properties'][comp_b]['molar_mass']
-                V_a = self.constants['gas_properties'][comp_a]['diffusion_volume']
-                V_b = self.constants['gas_properties'][comp_b]['diffusion_volume']
-                # 计算二元扩散系数 (两个组分间仅计算一次)
-                # 输入(温度, 压力, 组分a摩尔质量, 组分b摩尔质量, 组分a扩散体积, 组分b扩散体积)
-                D = self.formula_24(T, P, M_a, M_b, V_a, V_b)
-                
-                # 对称赋值
-                D_ij[idx_a][idx_b] = D
-                D_ij[idx_b][idx_a] = D
+        # 二元扩散系数矩阵：同一单元内各组分共用，未传入时现算
+        if D_ij is None:
+            D_ij = self.formula_24_matrix(T, P, components)
         
         # 计算有效扩散系数，使用指定的组分索引i
         for j in range(len(xj)):
@@ -1044,6 +1334,7 @@ class CementProductionModel:
         # 输入：Ci,g(z_k)（当前段气体组分i浓度，变量）、Ci,g(z_k-1)（前一段气体组分i浓度，变量）、Δz（段长度）
         # 输出：∂zCi,g（气体组分i浓度轴向梯度）
         # 公式：∂_z C_i,g(z_k) = (C_i,g(z_k) - C_i,g(z_k-1)) / Δz
+        # 说明：各组分浓度梯度由模块内核 _backward_diff 整列计算
         return (C_i_g_current - C_i_g_prev) / delta_z
     
     def formula_24(self, T, P, M_i, M_j, V_i, V_j):
@@ -1055,14 +1346,62 @@ class CementProductionModel:
         M_ij = self.formula_76(M_i, M_j)
         P_atm = P / 101325  # 1 atm = 101325 Pa
         # 计算扩散系数
-        numerator = 0.00143 * (T ** 1.75)
-        denominator = P_atm * (M_ij ** 0.5) * ((V_i ** (1/3) + V_j ** (1/3)) ** 2)
+        numerator = 0.00143 * self._pow_1_75(T)
+        denominator = P_atm * math.sqrt(M_ij) * ((V_i ** (1/3) + V_j ** (1/3)) ** 2)
         
         if denominator == 0:
             return 0.0
         D_cm = numerator / denominator
         return D_cm * 1e-4
     
+    def _pow_1_75(self, T):
+        # 辅助函数：T^1.75 = T * sqrt(T * sqrt(T))，用两次开方代替非整数幂
+        # 输入：T（温度）
+        # 输出：T^1.75；T ≤ 0 时保持原幂运算的结果
+        if T > 0:
+            return T * math.sqrt(T * math.sqrt(T))
+        return T ** 1.75
+    
+    def formula_24_matrix(self, T, P, components):
+        # 24二元扩散系数（矩阵形式）
+        # 输入：T（温度，变量）、P（压力，变量）、components（组分列表）
+        # 输出：D_ij（N×N 二元扩散系数矩阵，对角线为 0）
+        # 公式：同公式24；M_ij^(1/2) 与 [(V_i)^(1/3) + (V_j)^(1/3)]^2 只与组分对有关，按组分列表缓存，
+        #       每次只需计算一次 T^1.75 与 P_atm
+        key = tuple(components)
+        pairs = self._diffusion_pairs.get(key)
+        if pairs is None:
+            num_comps = len(components)
+            M = [self._molar_mass[self._comp_idx[c]] for c in components]
+            V13 = [self.constants['gas_properties'][c]['diffusion_volume'] ** (1/3) for c in components]
+            M_root = [[0.0] * num_comps for _ in range(num_comps)]
+            V_sq = [[0.0] * num_comps for _ in range(num_comps)]
+            for a in range(num_comps):
+                for b in range(a + 1, num_comps):
+                    M_root[a][b] = M_root[b][a] = math.sqrt(self.formula_76(M[a], M[b]))
+                    V_sq[a][b] = V_sq[b][a] = (V13[a] + V13[b]) ** 2
+            pairs = (M_root, V_sq)
+            self._diffusion_pairs[key] = pairs
+        M_root, V_sq = pairs
+        
+        num_comps = len(components)
+        numerator = 0.00143 * self._pow_1_75(T)
+        P_atm = P / 101325  # 1 atm = 101325 Pa
+        D_ij = [[0.0] * num_comps for _ in range(num_comps)]
+        
+        # 仅遍历矩阵的上三角部分 (b > a)，利用 D_ab = D_ba 填充
+        for a in range(num_comps):
+            for b in range(a + 1, num_comps):
+                denominator = P_atm * M_root[a][b] * V_sq[a][b]
+                if denominator == 0:
+                    D = 0.0
+                else:
+                    D = numerator / denominator * 1e-4
+                D_ij[a][b] = D
+                D_ij[b][a] = D
+        
+        return D_ij
+    
     def formula_25(self, vs, C_i_s):
         # 25固体组分i物质通量
         # 输入：vs（公式13输出）、Ci,s（固体组分i浓度，变量）
@@ -1077,150 +1416,55 @@ class CementProductionModel:
         # 公式：r_j = k_r * T^n * e^(-E_A/RT) * ∏ P_i^β_i * ∏ C_i^α_i
         return "r_j = k_r * T^n * e^(-E_A/RT) * ∏ P_i^β_i * ∏ C_i^α_i"
     
-    def _calculate_reaction_rate(self, reaction_id, T, P_i_dict, C_i_dict):
-        # 辅助函数：计算反应速率
-        # 输入：reaction_id（反应标识）、T（温度）、P_i_dict（组分分压字典）、C_i_dict（组分浓度字典）
-        # 输出：rj（反应速率）
-        
-        # 获取反应速率系数
-        reaction_coeff = self.constants['reaction_rate_coefficients'][reaction_id]
-        kr = reaction_coeff['kr']
-        n = reaction_coeff['n']
-        EA = reaction_coeff['EA']
-        R = self.constants['R']
-        
-        # 获取反应级数
-        alpha1 = reaction_coeff['alpha1']
-        alpha2 = reaction_coeff['alpha2']
-        alpha3 = reaction_coeff['alpha3']
-        beta2 = reaction_coeff['beta2']
-        
-        # 根据反应ID确定反应物顺序，按反应物从左到右的顺序匹配对应的指数
-        reaction_reactants = {
-            'r1': ['CaCO3'],  # CaCO3 → CaO + CO2
-            'r2': ['CaO', 'SiO2'],  # 2CaO + SiO2 → C2S
-            'r3': ['CaO', 'C2S'],  # CaO + C2S → C3S
-            'r4': ['CaO', 'Al2O3'],  # 3CaO + Al2O3 → C3A
-            'r5': ['CaO', 'Al2O3', 'Fe2O3'],  # 4CaO + Al2O3 + Fe2O3 → C4AF
-            'r6': ['CO', 'O2'],  # 2CO + O2 → 2CO2
-            'r7': ['CO', 'H2O'],  # CO + H2O → CO2 + H2
-            'r8': ['H2', 'O2'],  # 2H2 + O2 → 2H2O
-            'r9': ['C_sus', 'O2'],  # 2C + O2 → 2CO
-            'r10': ['C_sus', 'H2O'],  # C + H2O → CO + H2
-            'r11': ['C_sus', 'CO2']  # C + CO2 → 2CO
-        }
-        
-        # 获取当前反应的反应物列表
-        reactants = reaction_reactants.get(reaction_id, [])
-        
-        # 计算分压乘积项 ∏ P_i^β_i
-        product_P = 1.0
-        # beta2对应第二个反应物的分压指数（如果第二个反应物是气体）
-        if len(reactants) > 1:
-            second_reactant = reactants[1]
-            if second_reactant in P_i_dict:
-                product_P *= P_i_dict[second_reactant] ** beta2
-        
-        # 计算浓度乘积项 ∏ C_i^α_i
-        product_C = 1.0
-        # 按反应物从左到右的顺序匹配对应的alpha指数
-        for i, reactant in enumerate(reactants):
-            if reactant in C_i_dict:
-                if i == 0:
-                    product_C *= C_i_dict[reactant] ** alpha1
-                elif i == 1:
-                    product_C *= C_i_dict[reactant] ** alpha2
-                elif i == 2:
-                    product_C *= C_i_dict[reactant] ** alpha3
-        
-        # 计算反应速率
-        r_j = kr * (T ** n) * math.exp(-(EA) / (R * T)) * product_P * product_C
-            
-        return r_j
-    
     def formula_27(self):
         # 27反应源项计算公式
         # 输出：反应源项公式字符串
         # 公式：[R_s; R_g] = v * r
         return "[R_s; R_g] = v * r"
     
-    def _calculate_reaction_source(self, Tg, Ts, P_i_dict, C_i_dict, active_reactions_dict=None):
+    def _calculate_reaction_source(self, Tg, Ts, P_i, C_i, rxn_js=None):
         # 辅助函数：计算反应源项
-        # 输入：T（温度）、P_i_dict（组分分压字典）、C_i_dict（组分浓度字典）、active_reactions_dict: 当前设备激活的反应系数表
-        # 输出：Rs,Rg（固/气相生成速率）
-        
-        # 获取化学计量矩阵
-        stoichiometric_matrix = self.constants['stoichiometric_matrix']['matrix']
-        
-        # 必须与 stoichiometric_matrix 的列定义严格对应
-        all_reaction_ids = ['r1', 'r2', 'r3', 'r4', 'r5', 'r6', 'r7', 'r8', 'r9', 'r10', 'r11']
-        # 建立映射: {'r1': 0, 'r2': 1, ..., 'r6': 5, ...}
-        rxn_col_map = {rid: idx for idx, rid in enumerate(all_reaction_ids)}
-
-        # 如果上传了经过过滤的字典，就用传进来的；否则用全局全量字典
-        if active_reactions_dict is None:
-            active_reactions_dict = self.constants['reaction_rate_coefficients']
-        
-        active_reaction_ids = list(active_reactions_dict.keys())
-        # 固体反应 (r1-r5) 和 气固反应 (r9-r11) 使用固体温度 Ts
-        use_Ts_reactions = ['r1', 'r2', 'r3', 'r4', 'r5', 'r9', 'r10', 'r11']
-        
-        # r1: 分解反应，基于 CaCO3 质量
-        # r2-r5: 形成反应，通常基于产物质量 (如 C2S)
-        # r10-r11: 气化反应，基于悬浮碳 C_sus
-        reaction_ref_comp = {
-            'r1': 'CaCO3', 
-            'r2': 'C2S', 
-            'r3': 'C3S', 
-            'r4': 'C3A', 
-            'r5': 'C4AF',
-            'r10': 'C_sus', 
-            'r11': 'C_sus'
-        }
-
-        # 计算所有反应的速率
-        rxn_rates_molar = {}
-        for reaction_id in active_reaction_ids:
-            if reaction_id in use_Ts_reactions:
-                T_calc = Ts
-            else:
-                T_calc = Tg
-
-            # 2. 计算基础速率
-            raw_rate = self._calculate_reaction_rate(reaction_id, T_calc, P_i_dict, C_i_dict)
-            
-            rxn_rates_molar[reaction_id] = raw_rate
+        # 输入：T（温度）、P_i（按组分顺序的分压列表）、C_i（按组分顺序的浓度列表）、rxn_js: 当前设备激活反应的下标元组
+        # 输出：Rs,Rg（固/气相生成速率）、rates（激活反应按 rxn_js 顺序的反应速率）
+        
+        # 如果上传了按区段预先换算的反应下标，就用传进来的；否则取全部反应
+        if rxn_js is None:
+            rxn_js = range(len(self._rxn_names))
+        
+        # 计算所有反应的速率：各反应的系数按下标从平行列表读取，整理温度后一次调用速率内核
+        # 各反应取 Ts 还是 Tg 由预先整理的温度标记决定（见 define_constants）
+        uses_Ts = self._rxn_uses_Ts
+        T_rxn = [Ts if uses_Ts[j] else Tg for j in rxn_js]
+        # 温度对数每个单元只算一次（气相、固相各一次）
+        log_Ts = math.log(Ts) if Ts > 0 else 0.0
+        log_Tg = math.log(Tg) if Tg > 0 else 0.0
+        logT_rxn = [log_Ts if uses_Ts[j] else log_Tg for j in rxn_js]
+        
+        rates = _reaction_rates(rxn_js, T_rxn, logT_rxn, P_i, C_i,
+                                self._kr, self._n, self._EA_R, self._a1, self._a2, self._a3, self._b2,
+                                self._rxn_reactant_idx, self._rxn_p_idx)
         
         # 确定固体和气体组分的分界点（根据化学计量矩阵定义，前9个为固体，后6个为气体）
         solid_gas_split = 9
         
-        # 计算固体相生成速率
-        Rs = [0.0] * solid_gas_split
-        Rg = [0.0] * (len(stoichiometric_matrix) - solid_gas_split)
-
-        # 遍历每一个组分
-        for i in range(len(stoichiometric_matrix)):
+        # 速率向量按矩阵列排列，未激活的反应速率为 0
+        r_vec = [0.0] * len(self._rxn_names)
+        for j, rate in zip(rxn_js, rates):
+            r_vec[j] = rate
+        
+        # 源项 = 化学计量矩阵 × 速率向量，只遍历各组分行的非零系数
+        R_all = [0.0] * len(self._stoich_nonzero)
+        for i, row_nz in enumerate(self._stoich_nonzero):
             total_change_rate = 0.0
-            
-            # 仅遍历当前激活的反应，并使用映射查找正确系数 
-            for rxn_id, rate in rxn_rates_molar.items():
-                # 找到该反应在矩阵中对应的列索引 (例如 'r6' -> 5)
-                col_idx = rxn_col_map.get(rxn_id)
-                
-                if col_idx is not None:
-                    # 获取化学计量数 (系数)
-                    coeff = stoichiometric_matrix[i][col_idx]
-                    if coeff != 0:
-                        # 源项 = 系数 * 速率
-                        total_change_rate += coeff * rate
-            
-            # 将累加结果存入 Rs 或 Rg
-            if i < solid_gas_split:
-                Rs[i] = total_change_rate
-            else:
-                Rg[i - solid_gas_split] = total_change_rate
+            for j, coeff in row_nz:
+                total_change_rate += coeff * r_vec[j]
+            R_all[i] = total_change_rate
         
-        return Rs, Rg, rxn_rates_molar
+        # 拆分为固体相和气体相生成速率
+        Rs = R_all[:solid_gas_split]
+        Rg = R_all[solid_gas_split:]
+        
+        return Rs, Rg, rates
     
     def formula_28(self, dN_i_s_dz, R_s_i):
         # 28固体质量守恒
@@ -1234,6 +1478,7 @@ class CementProductionModel:
         # 输入：Ni,s（公式25输出，空间离散点数据）通过相邻段Ni,s差值计算
         # 输出：∂zNi,s（固体组分i物质通量轴向梯度）
         # 公式：∂_z N_i,s(z_k) = (N_i,s(z_k) - N_i,s(z_k-1)) / Δz
+        # 说明：各组分通量梯度由模块内核 _backward_diff 整列计算
         return (N_i_s_current - N_i_s_prev) / delta_z
     
     def formula_30(self, dN_i_g_dz, R_g_i):
@@ -1248,6 +1493,7 @@ class CementProductionModel:
         # 输入：Ni,g（公式21输出，空间离散点数据），通过相邻段Ni,g差值计算
         # 输出：∂zNi,g（气体组分i物质通量轴向梯度）
         # 公式：∂_z N_i,g(z_k) = (N_i,g(z_k) - N_i,g(z_k-1)) / Δz
+        # 说明：各组分通量梯度由模块内核 _backward_diff 整列计算
         return (N_i_g_current - N_i_g_prev) / delta_z
     
     # 能量守恒与热传递方程
@@ -1265,13 +1511,16 @@ class CementProductionModel:
         # 公式：Re_D = (rho_g * vg * De) / mu_g
         return (rho_g * vg * De) / mu_g
     
-    def formula_34(self, r_c, theta):
+    def formula_34(self, r_c, theta, sin_half_theta=None):
         # 34有效直径
-        # 输入：rc（参数）、θ（填充角，公式18输出）
+        # 输入：rc（参数）、θ（填充角，公式18输出）、sin(θ/2)（可选，已算好时直接复用）
         # 输出：De（有效直径）
         # 公式：De = 2 * r_c * (math.pi - theta/2 + math.sin(theta)/2) / (math.pi - theta/2 + math.sin(theta/2))
-        numerator = math.pi - theta/2 + math.sin(theta)/2
-        denominator = math.pi - theta/2 + math.sin(theta/2)
+        if sin_half_theta is None:
+            sin_half_theta = math.sin(theta/2)
+        pi_minus_half = math.pi - theta/2
+        numerator = pi_minus_half + math.sin(theta)/2
+        denominator = pi_minus_half + sin_half_theta
         return 2 * r_c * numerator / denominator
     
     def formula_35(self, k_g, dp, ReD, Pr, Ags, Tg, Ts):
@@ -1342,14 +1591,12 @@ class CementProductionModel:
         
         return -gradient - (Qgsrad + Qgscv) / V_delta 
     
-    def formula_43(self, T_i):
+    def formula_43(self, T_prev, T_curr):
         # 43温度轴向梯度
-        # 输入：Ti（气体或固体温度，空间离散点数据，包含当前段和前一段的温度）
+        # 输入：T_prev（前一段的气体或固体温度）、T_curr（当前段的温度）
         # 输出：∂Ti/∂z（梯度）
         # 公式：∂Ti/∂z (z_k) = (Ti(z_k) - Ti(z_k-1)) / Δz
-        if len(T_i) < 2:
-            return 0.0
-        return (T_i[-1] - T_i[-2]) / self.dz
+        return (T_curr - T_prev) / self.dz
     
     def formula_44(self, H_tilde_s_zk, Q_tilde_s_zk, H_tilde_s_zk_prev, Q_tilde_s_zk_prev, delta_z, Qgsrad, Qgscv, V_delta):
         # 44回转窑固体能量平衡
@@ -1391,19 +1638,15 @@ class CementProductionModel:
         # 输出：aj（权重系数，j=0∼4）
         # 公式：a0 = 1 - Σa_j(j=1到4), aj = Σcj,i(T/Tref)^(i-1)(i=1到3)
         # 从constants获取Tref
-        Tref = self.constants['Tref']
+        Tref = self.K.Tref
+        
+        # 温度幂次 (T/Tref)^(i-1)，i=1..3，每次调用只算一次
+        T_ratio = T / Tref
+        p0, p1, p2 = 1.0, T_ratio, T_ratio ** 2
         
-        a = []
         # cj_i的结构是 [3 rows][4 columns]，对应 i=1-3, j=1-4
-        # 所以我们需要转置，j从0到3（对应j=1到4）
-        for j in range(4):
-            aj = 0.0
-            for i in range(3):
-                # 确保索引不越界
-                if i < len(cj_i) and j < len(cj_i[i]):
-                    #权重a_1 (对应矩阵第 0 列)，i为行，j为列
-                    aj += cj_i[i][j] * (T / Tref) ** (i)
-            a.append(aj)
+        # 按列转置后逐列做一次三项点积：a_j = Σ_i cj,i·(T/Tref)^(i-1)
+        a = [cj1 * p0 + cj2 * p1 + cj3 * p2 for cj1, cj2, cj3 in zip(*cj_i)]
         
         # 计算a0
         a0 = 1 - sum(a)
@@ -1442,13 +1685,11 @@ class CementProductionModel:
         C2_j_i = wsgg_coeffs.get('C2', [[0.0]*3 for _ in range(4)])
         C3_j_i = wsgg_coeffs.get('C3', [[0.0]*3 for _ in range(4)])
         
-        cj_i = []
-        for C1, C2, C3 in zip(C1_j_i, C2_j_i, C3_j_i):
-            cj = []
-            for c1, c2, c3 in zip(C1, C2, C3):
-                cj_val = c1 + c2 * h2o_co2_ratio + c3 * (h2o_co2_ratio ** 2)
-                cj.append(cj_val)
-            cj_i.append(cj)
+        # 比值及其平方只算一次，逐元素 cj,i = C1 + C2·r + C3·r²
+        r = h2o_co2_ratio
+        r_sq = r ** 2
+        cj_i = [[c1 + c2 * r + c3 * r_sq for c1, c2, c3 in zip(C1, C2, C3)]
+                for C1, C2, C3 in zip(C1_j_i, C2_j_i, C3_j_i)]
         return cj_i
     
     def formula_49(self, r_c):
@@ -1477,6 +1718,7 @@ class CementProductionModel:
         # 输入：reaction_rates（反应速率字典，键为反应ID，值为反应速率）、reaction_enthalpies（反应焓变字典，键为反应ID，值为反应焓变）
         # 输出：Jsg（总反应焓变）
         # 公式：J_sg = Σ (r_j × ΔH_rj(T))
+        # 说明：反应焓变由模块内核 _reaction_heats 计算（气相、固相分开累加）
         total_enthalpy = 0.0
         for reaction_id, rate in reaction_rates.items():
             if reaction_id in reaction_enthalpies:
@@ -1493,39 +1735,25 @@ class CementProductionModel:
         # 计算料床表面积：输入(设备半径)，输出(料床表面积)
         S_m = self.formula_49(r_c)
         
-        # 2. 计算温度相关系数cj,i（公式48）
-        # 计算温度相关系数：输入(无)，输出(温度相关系数)
-        cj_i = self.formula_48()
+        # 2. 温度相关系数cj,i（公式48，H2O/CO2 比值固定，取 define_parameters 中的预计算结果）
+        cj_i = self._wsgg_cj_i
         
         # 3. 计算权重系数aj（公式46）
         # 计算权重系数：输入(温度相关系数, 温度)，输出(权重系数)
         a_j = self.formula_46(cj_i, T)
         
-        # 4. 计算吸收系数kj（公式47）
-        # 计算吸收系数：输入(无)，输出(吸收系数)
-        k_j = self.formula_47()
+        # 4. 吸收系数kj（公式47，同样取预计算结果）
+        k_j = self._wsgg_k_j
         
-        # 5. 计算气体发射率（累加计算，j从0到4）
+        # 5. 计算气体发射率：j=0 为透明窗口（k=0，贡献恒为 0），只需累加 j=1..4 的灰气体
+        # WSGG模型系数的压力单位是atm，需要将Pa转换为atm
+        P_atm = P / 101325  # 1 atm = 101325 Pa
+        x_sum = xH2O + xCO2
+        expm1 = math.expm1
         epsilon_g = 0.0
-        for j in range(5):  # j=0到4
-            # 获取当前j对应的a_j
-            a = a_j[j] if j < len(a_j) else 0.0
-            # j=0 为透明窗口，k必须为 0
-            # j>0 对应灰气体，k取 k_j[j-1]
-            if j == 0:
-                k = 0.0
-            elif j > 0 and j - 1 < len(k_j):
-                k = k_j[j - 1]
-            else:
-                k = 0.0
-
-            # 计算指数项
-            # WSGG模型系数的压力单位是atm，需要将Pa转换为atm
-            P_atm = P / 101325  # 1 atm = 101325 Pa
-            exponent = -k * S_m * P_atm * (xH2O + xCO2)
-            
-            # 累加计算气体发射率
-            epsilon_g += a * (1 - math.exp(exponent))
+        for a, k in zip(a_j[1:], k_j):
+            # 1 - e^x 用 -expm1(x) 计算，小指数时精度更好
+            epsilon_g += a * -expm1(-k * S_m * P_atm * x_sum)
         
         return epsilon_g
     
@@ -1636,26 +1864,21 @@ class CementProductionModel:
         # 输入：hi,s（固体组分i摩尔焓，公式50输出）、Ni,s（固体组分i通量，公式25输出）
         # 输出：H~s（固体焓通量密度）
         # 公式：H~_s = Σ (h_i,s · N_i,s)
-        H_tilde_s = 0.0
-        for h, N in zip(h_i_s, N_i_s):
-            H_tilde_s += h * N
-        return H_tilde_s
+        return _dot(h_i_s, N_i_s)
     
     def formula_69(self, h_g, N_g):
         # 69气体焓通量密度
         # 输入：hg（气体组分i摩尔焓，公式50输出）、Ng（气体组分i通量，公式21输出）
         # 输出：H~g（气体焓通量密度）
         # 公式：H~_g = Σ (h_i,g · N_i,g)
-        H_tilde_g = 0.0
-        for h, N in zip(h_g, N_g):
-            H_tilde_g += h * N
-        return H_tilde_g
+        return _dot(h_g, N_g)
     
     def formula_70(self, H, delta_z):
         # 70焓通量密度梯度
         # 输入：H（气体或固体焓通量密度，公式68、69输出）、Δz（窑炉单段长度）
         # 输出：∂zH（气体或固体焓通量密度梯度）
         # 公式：∂_z H(z_k) = (H(z_k) - H(z_k-1)) / Δz
+        # 说明：焓梯度在 _energy_transport_only 中按两点差分直接计算
         if len(H) < 2:
             return 0.0
         return (H[-1] - H[-2]) / delta_z
@@ -1686,6 +1909,7 @@ class CementProductionModel:
         # 输入：h(z)（公式72输出，空间离散点数据，包含当前段和前一段的床层高度）
         # 输出：∂h(z)/∂z（床层高度轴向梯度）
         # 公式：∂h(z)/∂z = (h(z_k) - h(z_{k-1})) / Δz
+        # 说明：床层高度梯度在 _solid_velocity_formula_13 中按两点差分直接计算
         if len(h_z) < 2:
             return 0.0
         return (h_z[-1] - h_z[-2]) / self.dz
@@ -1705,13 +1929,10 @@ class CementProductionModel:
     
     def formula_77(self, C_i_g):
         # 77气体总摩尔浓度
-        # 输入：Ci,g（气体i组分摩尔浓度）
+        # 输入：Ci,g（气体i组分摩尔浓度列表）
         # 输出；cg（气体总摩尔浓度）
         # 公式：c_g = Σ C_j,g
-        if isinstance(C_i_g, dict):
-            return sum(C_i_g.values())
-        else:
-            return sum(C_i_g)
+        return sum(C_i_g)
     
     def formula_78(self, A_t, A_s):
         # 78气体横截面积
@@ -1732,11 +1953,9 @@ class CementProductionModel:
         # 输入：cp,i_list（各气体组分摩尔热容列表，公式 6 输出）、M_i_list（各气体组分摩尔质量列表，常数）、n_i_list（各气体组分摩尔数列表，公式57_gas输出）
         # 输出： cp,g（气体比热容）
         # 公式：cp,g = Σ(ni*cp,i) / Σ(ni*Mi)
-        numerator = 0.0
-        denominator = 0.0
-        for cp_i, M_i, n_i in zip(cp_i_list, M_i_list, n_i_list):
-            numerator += n_i * cp_i
-            denominator += n_i * M_i
+        # 说明：气体比热容由模块内核 _gas_specific_heat 计算
+        numerator = _dot(n_i_list, cp_i_list)
+        denominator = _dot(n_i_list, M_i_list)
         
         if denominator == 0:
             return 0.0
@@ -1756,35 +1975,8 @@ class CementProductionModel:
                 # 所有相邻单元都进行物料转移（这样确保浓度沿着系统流动）
                 #self._transfer_between_cells(self.cells[i], self.cells[i+1])
             
-            # 内层单元遍历循环：沿物料流动方向依次遍历所有有限体积单元
-            for i, cell in enumerate(self.cells):
-                # ① 识别单元所属设备，根据单元索引获取单元所属的工艺区段
-                section = self._get_cell_section(i)
-                
-                # 预热器单元不需要计算
-                #if section == 'preheater':
-                #    continue
-                
-                # 获取设备配置
-                config = self.section_configs[section].copy()
-                
-                # 传入设备类型，以便获取设备特定的执行规则
-                #存储当前单元的工艺类型
-                config['device_type'] = section
-                
-                # ② 读取匹配：对应设备的「差异化配置」+ 全局「通用公共规则」
-                #整合通用规则和当前设备的差异化规则，形成完整执行清单
-                execution_rules = self._get_execution_rules(config)
-                
-                # ③ 代数计算：按配置调用对应公式，计算所有代数变量
-                algebraic_vars = self._perform_algebraic_calculations(cell, execution_rules)
-                
-                # ④ 微分求解：按配置调用对应公式，代入代数变量，求解浓度变化率和内能变化率
-                dC_dt, dU_dt_dict = self._solve_differential_equations(cell, execution_rules, algebraic_vars)
-                
-                # ⑤ 同步更新：新值 = 原值 + 变化率 × Δt
-                # 同一个时间步 Δt 内，同一个单元里，代数计算和微分计算同时代入
-                self._update_variables(cell, dC_dt, dU_dt_dict)
+            # 推进一个时间步：沿物料流动方向扫描全部单元
+            self._advance_one_step()
 
             # 单元边界衔接：确保三段工艺无缝衔接
             #将前一段工艺最后一个单元的变量传递给后一段工艺的第一个单元
@@ -1809,11 +2001,46 @@ class CementProductionModel:
         else:
             print("达到最大迭代步数，模型未收敛")
     
-    def _get_cell_section(self, cell_index):
-        # 根据单元索引判断所属工艺区段
-        # 前一区段最后一个单元无缝衔接后一区段第一个单元
-        return self.variables['device_type'][cell_index] #根据索引获取该单元的工艺类型
-    
+    def _advance_one_step(self):
+        # 单步推进（细传播子）：状态 y_n → y_{n+1}
+        # 沿物料流动方向做一次 Gauss-Seidel 迎风扫描，单元 i 使用单元 i-1 本步已更新的值
+        # 说明：外层迭代是向稳态收敛的伪时间推进，相邻步之间强耦合，
+        #       时间并行（Parareal）需要的粗传播子和多份状态副本在此不带来收益，故保持串行推进
+        
+        # 整列批量预计算：各单元填充率/填充角只依赖自身状态，扫描前一次算完
+        column_geometry = self._batch_fill_geometry(self.cells)
+        
+        # 单元循环内逐个调用的三步求解方法绑定为局部变量，省去每个单元的属性查找
+        cells = self.cells
+        perform_algebraic_calculations = self._perform_algebraic_calculations
+        solve_differential_equations = self._solve_differential_equations
+        update_variables = self._update_variables
+        
+        # 按区段遍历：预热器→分解炉→回转窑，同一区段的单元共用一份执行规则
+        # 说明：单元 i 的入口条件取自单元 i-1 本步更新后的值，区段内各单元须按顺序逐个求解，不能整段并行
+        for section, start, stop in self._section_ranges:
+            # 预热器单元不需要计算
+            #if section == 'preheater':
+            #    continue
+            
+            # ① 读取匹配：对应设备的「差异化配置」+ 全局「通用公共规则」
+            #整合后的完整执行清单已按区段预先生成（见 spatial_discretization）
+            execution_rules = self._execution_rules_by_section[section]
+            
+            # 内层单元遍历循环：沿物料流动方向依次遍历该区段的有限体积单元
+            for i in range(start, stop):
+                cell = cells[i]
+                
+                # ② 代数计算：按配置调用对应公式，计算所有代数变量
+                algebraic_vars = perform_algebraic_calculations(cell, execution_rules, column_geometry[i])
+                
+                # ③ 微分求解：按配置调用对应公式，代入代数变量，求解浓度变化率和内能变化率
+                dC_dt, dU_dt_dict = solve_differential_equations(cell, execution_rules, algebraic_vars)
+                
+                # ④ 同步更新：新值 = 原值 + 变化率 × Δt
+                # 同一个时间步 Δt 内，同一个单元里，代数计算和微分计算同时代入
+                update_variables(cell, dC_dt, dU_dt_dict)
+
     def _get_execution_rules(self, config):
         # 整合通用公共规则和当前设备的差异化配置，生成单元的完整执行规则清单
         # 通用公式统一计算，差异化公式根据设备分别计算
@@ -1838,9 +2065,215 @@ class CementProductionModel:
         execution_rules = common_rules.copy() #复制通用规则，作为基础规则
         execution_rules.update(config) #用当前设备的差异化配置 覆盖通用规则
         
+        # 规则标识一次性解析为方法句柄，逐单元计算时直接调用
+        self._compile_rule_handles(execution_rules)
+        
         return execution_rules #返回整合后的完整执行规则清单，供后续计算调用
     
-    def _perform_algebraic_calculations(self, cell, rules):
+    def _select_active_reactions(self, section, rules):
+        # 筛选当前设备激活的反应速率系数
+        # 输入：section（设备类型）、rules（该设备的完整执行规则）
+        # 输出：{反应标识: 反应速率系数}，按反应列表顺序排列；无反应时为空字典
+        # 根据差异化配置获取当前设备的反应列表
+        reactions = rules.get('reactions', [])
+        
+        # 如果没有指定反应列表，根据设备类型设置默认反应
+        if not reactions: #判断反应列表是否为空
+            if section == 'calciner':
+                reactions = ['r1', 'r6', 'r7', 'r8', 'r9', 'r10', 'r11']  # 分解炉仅r1分解反应
+            elif section == 'kiln':
+                reactions = ['r1', 'r2', 'r3', 'r4', 'r5', 'r6', 'r7', 'r8', 'r9', 'r10', 'r11']  # 回转窑r2~r5熟料反应
+            else:
+                reactions = []  # 其他设备无反应
+        
+        # 获取全局反应系数表，生成局部的激活反应字典
+        all_reaction_coeffs = self.constants['reaction_rate_coefficients']
+        return {r: all_reaction_coeffs[r] for r in reactions if r in all_reaction_coeffs}
+    
+    def _compile_rule_handles(self, rules):
+        # 将执行规则中的公式标识解析为方法句柄
+        # 输入：rules（某区段的完整执行规则，原地补充以下划线开头的句柄项）
+        # 输出：rules['_gas_velocity_fn']、['_solid_velocity_fn']、['_heat_transfer_fn']、['_energy_eq_fn']
+        # 说明：规则只取决于区段，解析一次即可；逐单元计算时直接调用句柄，不再做类型判断与字符串比较
+        # 气相速度：预热器直接取进料流速，其余设备按公式10计算
+        if rules.get('gas_velocity', 'formula_10') == 'given_parameter':
+            rules['_gas_velocity_fn'] = self._gas_velocity_given
+        else:
+            rules['_gas_velocity_fn'] = self._gas_velocity_formula_10
+        
+        # 固相速度：常数配置 / 公式71（分解炉）/ 公式13（回转窑）
+        solid_velocity_rule = rules.get('solid_velocity', 'formula_71')
+        if isinstance(solid_velocity_rule, (int, float)):
+            rules['_solid_velocity_fn'] = partial(self._solid_velocity_constant, float(solid_velocity_rule))
+        elif solid_velocity_rule == 'formula_71':
+            rules['_solid_velocity_fn'] = self._solid_velocity_formula_71
+        elif solid_velocity_rule == 'formula_13':
+            rules['_solid_velocity_fn'] = self._solid_velocity_formula_13
+        else:
+            rules['_solid_velocity_fn'] = self._solid_velocity_unset
+        
+        # 对流换热：公式35（分解炉）/ 公式39（回转窑）；无对流换热（预热器）时为 None
+        heat_transfer_rule = rules.get('heat_transfer', 'formula_35')
+        if heat_transfer_rule == 'formula_35':
+            rules['_heat_transfer_fn'] = self._convection_formula_35
+        elif heat_transfer_rule == 'formula_39':
+            rules['_heat_transfer_fn'] = self._convection_formula_39
+        else:
+            rules['_heat_transfer_fn'] = None
+        
+        # 能量方程：无配置为纯输运（预热器），公式44、45为气固双方程；其他配置不计算内能变化率
+        energy_eq = rules.get('energy_eq')
+        if energy_eq is None:
+            rules['_energy_eq_fn'] = self._energy_transport_only
+        elif isinstance(energy_eq, list) and len(energy_eq) >= 2:
+            rules['_energy_eq_fn'] = self._energy_two_equation
+        else:
+            rules['_energy_eq_fn'] = None
+    
+    def _gas_velocity_given(self, DH, rho_g, mu_g, dP_dz):
+        # 预热器气相速度：直接使用气体进料的初始流速
+        return self.control_variables['gas_feed']['initial_velocity']
+    
+    def _gas_velocity_formula_10(self, DH, rho_g, mu_g, dP_dz):
+        # 分解炉/回转窑气相速度：使用公式10基于压力梯度计算
+        # SI 单位，需将 g 转换为 kg
+        rho_g_SI = rho_g * 1e-3
+        mu_g_SI = mu_g * 1e-3
+        return self.formula_10(DH, mu_g_SI, rho_g_SI, dP_dz)
+    
+    def _solid_velocity_constant(self, value, vg, r_c, theta, sin_half_theta, index, prev_alg):
+        # 预热器固相速度：配置为常数值
+        return value
+    
+    def _solid_velocity_formula_71(self, vg, r_c, theta, sin_half_theta, index, prev_alg):
+        # 分解炉固相速度：vs = vg
+        return self.formula_71(vg)
+    
+    def _solid_velocity_formula_13(self, vg, r_c, theta, sin_half_theta, index, prev_alg):
+        # 回转窑固相流速（公式13）
+        # 输入：vg（气相速度）、r_c/theta/sin_half_theta（本单元填充几何）、index（单元索引）、prev_alg（上游单元代数变量）
+        kiln_geom = self._geom['kiln']
+        omega = kiln_geom['omega']  # 窑转速（与休止角正余弦取自同一份几何快照）
+        psi = kiln_geom['psi']  # 窑倾角
+        
+        # 计算料床长度：输入(设备半径, 填充角)，输出(料床长度)
+        Lc = self.formula_14(r_c, theta, sin_half_theta)
+        
+        # 计算床层高度：输入(设备半径, 填充角)，输出(床层高度)
+        h_current = self.formula_72(r_c, theta)
+        
+        # 获取前一个单元的床层高度
+        h_prev = h_current  # 默认情况：如果是第一个单元，前一个单元的床层高度等于当前单元
+        if index > 0: #若不是第一个单元
+            prev_theta = prev_alg.get('theta', theta) #读取前一个单元的填充角
+            # 计算床层高度：输入(设备半径, 填充角)，输出(床层高度)
+            h_prev = self.formula_72(r_c, prev_theta) #计算前一个单元的床层高度
+        
+        # 计算床层高度轴向梯度（公式74）：(h(z_k) - h(z_k-1)) / Δz，两点差分直接相减，不再构造列表
+        dh_z_dz = (h_current - h_prev) / self.dz
+        
+        # 计算料流角：输入(床层高度轴向梯度)，输出(料流角)
+        phi_z = self.formula_73(dh_z_dz)
+
+        # 计算固体速度：输入(角速度, 窑倾角, 休止角正余弦, 设备直径, 料床长度, 料流角)，输出(固体速度)
+        return self.formula_13(omega, psi, kiln_geom['sin_xi'], kiln_geom['cos_xi'], kiln_geom['two_rc'], Lc, phi_z)
+    
+    def _solid_velocity_unset(self, vg, r_c, theta, sin_half_theta, index, prev_alg):
+        # 未配置固相速度公式：本单元尚无已算出的固相速度，返回 None
+        return None
+    
+    def _convection_formula_35(self, algebraic_vars, k_g, Pr, ReD, Ags, De, rho_g, mu_g, eta, Tg, Ts):
+        # 分解炉对流换热（公式35）
+        dp = self._d_p  # 颗粒直径
+        # 计算对流换热量：输入(气体热导率, 颗粒直径, 轴向雷诺数, 普朗特数)，输出(对流换热量)
+        return self.formula_35(k_g, dp, ReD, Pr, Ags, Tg, Ts)
+    
+    def _convection_formula_39(self, algebraic_vars, k_g, Pr, ReD, Ags, De, rho_g, mu_g, eta, Tg, Ts):
+        # 回转窑对流换热（公式39），对流换热系数 beta 存入 algebraic_vars
+        # 计算旋转雷诺数：输入(气体密度, 有效直径, 气体粘度, 角速度)，输出(旋转雷诺数)
+        Re_omega = self.formula_36(rho_g, De, mu_g, self._geom['kiln']['omega'])  # 窑转速取自几何快照，与公式13 一致
+
+        # 计算努塞尔数：输入(轴向雷诺数, 旋转雷诺数, 填充率)，输出(努塞尔数)
+        Nu = self.formula_37(ReD, Re_omega, eta)
+
+        # 计算对流换热系数：输入(气体热导率, 有效直径, 努塞尔数)，输出(对流换热系数)
+        beta = self.formula_38(k_g, De, Nu)
+
+        # 计算对流换热量：输入(气固换热面积, 对流换热系数, 气体温度, 固体温度)，输出(对流换热量)
+        Qgscv = self.formula_39(Ags, beta, Tg, Ts)
+        algebraic_vars['beta'] = beta #存储对流换热系数
+        return Qgscv
+    
+    def _energy_transport_only(self, H_tilde_s, Q_tilde_s, H_s_prev, Q_s_prev, H_tilde_g, Q_tilde_g, H_g_prev, Q_g_prev,
+                               delta_z, Qgsrad, Qgscv, V_delta):
+        # 预热器：纯输运模式 (无能量方程配置)
+        # 公式: dU/dt = -dH/dz
+        # 输出：(固体内能变化率, 气体内能变化率)
+        # 计算焓梯度（公式70）：(H(z_k) - H(z_k-1)) / Δz，两点差分直接相减
+        dH_s_dz = (H_tilde_s - H_s_prev) / delta_z
+        dH_g_dz = (H_tilde_g - H_g_prev) / delta_z
+        return -dH_s_dz, -dH_g_dz
+    
+    def _energy_two_equation(self, H_tilde_s, Q_tilde_s, H_s_prev, Q_s_prev, H_tilde_g, Q_tilde_g, H_g_prev, Q_g_prev,
+                             delta_z, Qgsrad, Qgscv, V_delta):
+        # 分解炉、回转窑：气固双方程独立求解
+        # 输出：(固体内能变化率, 气体内能变化率)
+        # 公式44: 固体能量平衡
+        dU_dt_solid = self.formula_44(
+            H_tilde_s, Q_tilde_s, 
+            H_s_prev, Q_s_prev, 
+            delta_z, Qgsrad, Qgscv, V_delta
+        )
+        # 公式45: 气体能量平衡
+        dU_dt_gas = self.formula_45(
+            H_tilde_g, Q_tilde_g, 
+            H_g_prev, Q_g_prev, 
+            delta_z, Qgsrad, Qgscv, V_delta
+        )
+        return dU_dt_solid, dU_dt_gas
+    
+    def _batch_fill_geometry(self, cells):
+        # 整列批量计算各单元的几何与填充参数（填充率 η、填充角 θ）
+        # 输入：cells（单元列表）
+        # 输出：每个单元对应的 {r_c, A_t, A_s, eta, theta, sin_half_theta} 字典列表
+        # 说明：这些量只取决于单元自身的固相浓度，在同一迭代步内不受上游单元更新影响，
+        #       因此可在逐单元迎风扫描之前一次算完；组分属性表对整列只构建一次
+        # 计算体积所需的摩尔质量和密度（含 C_sus，按 C[:10] 顺序排列，见 define_constants）
+        solid_M = self._solid_M
+        solid_rho = self._solid_rho
+        
+        # 组分循环内调用的公式绑定为局部变量，省去逐次属性查找
+        formula_57 = self.formula_57
+        column_geometry = []
+        for cell in cells:
+            # 设备半径与总横截面积（公式17）取自预计算的几何常量
+            geom = self._geom[cell['device_type']]
+            r_c = geom['r_c']
+            A_t = geom['A_t']
+            
+            # 获取当前固体摩尔数 
+            current_C = cell['state_variables']['C']
+            V_delta = geom['V_delta'] # 单段总体积（公式58，预计算）
+            
+            # 摩尔数 = 浓度 * 总体积；悬浮碳 C_sus (虽然在 gas_components 中，但计算几何体积时归为固体)
+            # 固体组分与 C_sus 正好是浓度列表的前 10 位
+            solid_moles = [formula_57(V_delta, conc) for conc in current_C[:10]]
+            
+            # 计算固体总体积 Vs、固体截面积 As、填充率 η
+            V_s = self.formula_8(solid_M, solid_rho, solid_moles)
+            A_s = self.formula_19(cell['delta_z'], V_s)
+            eta = self.formula_18(A_s, A_t)
+            
+            # 反算填充角 Theta (调用的反向求解器)
+            theta = self._calculate_fill_angle(eta)
+            
+            # sin(θ/2) 供弦长（公式14）与有效直径（公式34）共用，每个单元只算一次
+            column_geometry.append({'r_c': r_c, 'A_t': A_t, 'A_s': A_s, 'eta': eta, 'theta': theta,
+                                    'sin_half_theta': math.sin(theta / 2)})
+        
+        return column_geometry
+    
+    def _perform_algebraic_calculations(self, cell, rules, fill_geometry=None):
 
         # 通用公式统一计算，差异化公式根据设备分别计算
         algebraic_vars = {} #存储当前单元计算出的所有代数变量
@@ -1849,54 +2282,15 @@ class CementProductionModel:
         device_type = cell['device_type']
       
 #一、基础几何与填充参数计算  
-        # 1. 计算填充率和填充角
-        r_c = self.parameters['equipment'][device_type]['radius']
-        
-        # 计算总横截面积：输入(设备半径)，输出(总横截面积)
-        A_t = self.formula_17(r_c)
-
-        # 获取固体组分列表
-        stoichiometric_matrix = self.constants['stoichiometric_matrix']
-        solid_components = stoichiometric_matrix['components'][:9]
-        
-        # 准备计算体积所需的摩尔质量和密度字典
-        solid_M = {c: self.constants['solid_properties'][c]['molar_mass'] for c in solid_components}
-        solid_rho = {c: self.constants['solid_properties'][c]['density'] for c in solid_components}
-        
-        # C_sus 的物理属性
-        if 'C_sus' in self.constants['gas_properties']:
-             props = self.constants['gas_properties']['C_sus']
-             solid_M['C_sus'] = props['molar_mass']
-             solid_rho['C_sus'] = props['density']
-
-        # 获取当前固体摩尔数 
-        current_C = cell['state_variables']['C']
-        V_delta = self.formula_58(A_t, cell['delta_z']) # 单段总体积
-        
-        solid_moles = {}
-        for comp in solid_components:
-            conc = current_C.get(comp, 0.0)
-            # 摩尔数 = 浓度 * 总体积
-            n_i = self.formula_57(V_delta, conc)
-            solid_moles[comp] = n_i
-            
-        # 悬浮碳 C_sus (虽然在 gas_components 中，但计算几何体积时归为固体)
-        if 'C_sus' in current_C:
-            conc = current_C['C_sus']
-            n_i = self.formula_57(V_delta, conc) 
-            solid_moles['C_sus'] = n_i
-
-        # 计算固体总体积 Vs
-        V_s = self.formula_8(solid_M, solid_rho, solid_moles)
-        
-        # 3. 计算固体截面积
-        A_s = self.formula_19(cell['delta_z'], V_s)
-        
-        # 4. 计算填充率
-        eta = self.formula_18(A_s, A_t)
-
-        # 5. 反算填充角 Theta (调用的反向求解器)
-        theta = self._calculate_fill_angle(eta)
+        # 填充率与填充角只依赖本单元自身的浓度，可由整列批量预先计算（见 _batch_fill_geometry）
+        if fill_geometry is None:
+            fill_geometry = self._batch_fill_geometry([cell])[0]
+        r_c = fill_geometry['r_c']
+        A_t = fill_geometry['A_t']
+        A_s = fill_geometry['A_s']
+        eta = fill_geometry['eta']
+        theta = fill_geometry['theta']
+        sin_half_theta = fill_geometry['sin_half_theta']
         
         # 将填充角和填充率存储在代数变量中，供后续计算使用
         algebraic_vars['theta'] = theta
@@ -1908,213 +2302,126 @@ class CementProductionModel:
 #二、初始温度与压力设置   
         # 获取当前时刻的状态变量
         state_vars = cell['state_variables'] #获取单元的状态变量字典
-        C = state_vars['C']  # 组分浓度向量
+        C = state_vars['C']  # 组分浓度向量（按组分顺序的列表）
+        comp_idx = self._comp_idx
+        # 组分循环内调用的公式绑定为局部变量，省去逐次属性查找
+        formula_25 = self.formula_25
         
         # 初始温度和压力（如果是第一次迭代，使用默认值）
         Tg = cell['algebraic_variables']['Tg']
         Ts = cell['algebraic_variables']['Ts']
         P = cell['algebraic_variables']['P']
 
+        # 上游相邻单元（本步扫描中已先行更新）的代数变量字典与全局浓度行，本函数内只取一次，
+        # 填充角、浓度梯度由此读取
+        # 上游的 Tg、Ts、P 直接读全局代数变量数组（_update_variables 每个单元更新后同步写回），按下标取值
+        if index > 0:
+            prev_alg = self.cells[index-1]['algebraic_variables']
+            prev_C = self.variables['state_variables']['C'][index-1]
+            global_alg = self.variables['algebraic_variables']
+            prev_Tg = global_alg['Tg'][index-1]
+            prev_Ts = global_alg['Ts'][index-1]
+            prev_P = global_alg['P'][index-1]
+        else:
+            # 入口单元：上游取自身值，梯度为 0
+            prev_alg = None
+            prev_C = None
+            prev_Tg = Tg
+            prev_Ts = Ts
+            prev_P = P
+
   
 #三、组分摩尔焓计算      
-        # 获取所有组分列表
-        stoichiometric_matrix = self.constants['stoichiometric_matrix'] #从化学计量矩阵中获取组分信息
-        all_components = stoichiometric_matrix['components'] #提取所有组分名称
-        solid_components = all_components[:9]
-        gas_components = all_components[9:]
-        
-        # 1. 计算各组分的摩尔焓
-        h_i_s = []  # 固体组分i摩尔焓列表
-        h_i_g = []  # 气体组分i摩尔焓列表
-        
-        T0 = self.constants['T0']
-        
-        for component in solid_components: #遍历所有固体组分，逐个计算摩尔焓
-            # 获取组分的热容系数
-            if component in self.constants['molar_heat_capacity']: #判断该组分是否有热容系数数据
-                coeffs = self.constants['molar_heat_capacity'][component]
-            else:
-                coeffs = {'C0': 0.0, 'C1': 0.0, 'C2': 0.0}
-            
-            C0 = coeffs['C0']
-            C1 = coeffs['C1']
-            C2 = coeffs['C2']
-
-            # 计算积分焓：输入(热容系数C0, C1, C2, 参考温度T0, 当前温度T)，输出(积分焓)
-            integral_enthalpy = self.formula_5(C0, C1, C2, T0, Ts)
-            
-            # 获取标准生成焓
-            Hf_i = self.constants['standard_enthalpy'].get(component, 0.0)
-
-            # 计算摩尔焓：输入(标准生成焓, 积分焓)，输出(摩尔焓)
-            h_i = self.formula_50(Hf_i, integral_enthalpy)
-            h_i_s.append(h_i) #将固体组分的摩尔焓添加到h_i_s列表
+        # 获取气体组分列表（预先缓存，见 _cache_constants）
+        gas_components = self._gas_components
         
-        for component in gas_components:
-            # 获取组分的热容系数
-            if component in self.constants['molar_heat_capacity']:
-                coeffs = self.constants['molar_heat_capacity'][component]
-            else:
-                coeffs = {'C0': 0.0, 'C1': 0.0, 'C2': 0.0}
-            
-            C0 = coeffs['C0']
-            C1 = coeffs['C1']
-            C2 = coeffs['C2']
-
-            # 计算积分焓：输入(热容系数C0, C1, C2, 参考温度T0, 当前温度T)，输出(积分焓)
-            integral_enthalpy = self.formula_5(C0, C1, C2, T0, Tg)
-            
-            # 获取标准生成焓
-            Hf_i = self.constants['standard_enthalpy'].get(component, 0.0)
-
-            # 计算摩尔焓：输入(标准生成焓, 积分焓)，输出(摩尔焓)
-            h_i = self.formula_50(Hf_i, integral_enthalpy)
-            h_i_g.append(h_i)  # 将气体组分的摩尔焓添加到h_i_g列表
+        # 单段总体积（公式58）只取决于设备截面积与段长，取预计算值
+        V_delta = self._geom[device_type]['V_delta']
+        
+        # 1. 计算各组分的摩尔焓（公式5 积分焓 + 公式50 摩尔焓），固体用 Ts、气体用 Tg
+        # 同一次遍历中一并得到各组分摩尔数（公式57）与相总焓（公式4），供第六、七部分直接使用
+        # 热容系数与标准生成焓按组分顺序预先整理（见 define_constants），整段一次算完
+        T0 = self.K.T0
+        h_i_s, solid_moles, H_s = _phase_enthalpy(self._cp_coeffs_s, self._Hf_s, T0, Ts, C[:9], V_delta)  # 固体组分i摩尔焓、摩尔数、总焓
+        h_i_g, gas_moles, H_g = _phase_enthalpy(self._cp_coeffs_g, self._Hf_g, T0, Tg, C[9:], V_delta)  # 气体组分i摩尔焓、摩尔数、总焓
 
 #四、物质通量计算        
         # 4. 计算各组分的通量
         
         # 计算压力梯度（公式62）
         delta_z = cell['delta_z']
-        if index > 0:
-            prev_cell = self.cells[index-1]
-            prev_P = prev_cell['algebraic_variables']['P']
-        else:
-            prev_P = P
+        # 上游压力 prev_P 已在第二部分读取
         # 计算压力梯度：输入(轴向步长, 当前压力, 前一压力)，输出(压力梯度)
         dP_dz = self.formula_62(delta_z, P, prev_P)
         
         # 计算气体横截面积：输入(总横截面积, 固体横截面积)，输出(气体横截面积)
         A_g = self.formula_78(A_t, A_s)
 
-        # 计算单段总体积：输入(总横截面积, 轴向步长)，输出(单段总体积)
-        V_delta = self.formula_58(A_t, delta_z)
+        # 单段总体积 V_delta 已在第三部分取得（公式58，预计算）
 
         # 计算水力直径：输入(单段总体积, 气体横截面积)，输出(水力直径)
         DH = self.formula_9(V_delta, A_g)
         
         # 计算气体密度：输入(气体性质字典, 气体浓度字典)，输出(气体密度)
-        gas_C = {component: C[component] for component in gas_components}
-        rho_g = self.formula_11(self.constants['gas_properties'], gas_C)
+        gas_C = C[9:]  # 气体组分浓度（按组分顺序的切片）
+        rho_g = self.formula_11(self._molar_mass_g, gas_C)
         
         # 获取气体粘度
-        mu_g = self.parameters['mu_g']
-
-        # 获取气体流速规则
-        gas_velocity_rule = rules.get('gas_velocity', 'formula_10')
-        if gas_velocity_rule == 'given_parameter':
-            # 预热器：直接使用气体进料的初始流速
-            vg = self.control_variables['gas_feed']['initial_velocity']
-        else:
-            # 分解炉/回转窑：使用公式10基于压力梯度计算
-            # SI 单位，需将 g 转换为 kg
-            rho_g_SI = rho_g * 1e-3
-            mu_g_SI = mu_g * 1e-3
-            vg = self.formula_10(DH, mu_g_SI, rho_g_SI, dP_dz)
-        
-        # 获取固相速度，使用差异化配置中的公式
-        solid_velocity_rule = rules.get('solid_velocity', 'formula_71')
-        if isinstance(solid_velocity_rule, (int, float)):
-            # 预热器：配置为常数值
-            vs = float(solid_velocity_rule)
-        elif solid_velocity_rule == 'formula_71':
-            # 分解炉：vs = vg
-            vs = self.formula_71(vg)
-        elif solid_velocity_rule == 'formula_13':
-            # 回转窑固相流速（公式13
-            omega = self.control_variables.get('omega')  # 窑转速
-            psi = self.parameters['equipment']['kiln']['angle']  # 窑倾角
-            
-            # 计算休止角（公式12）
-            a_omega = self.parameters.get('a_omega', 0.05)
-            b_omega = self.parameters.get('b_omega', 0.6)
-            # 计算固体休止角：输入(比例系数a, 截距b, 角速度)，输出(固体休止角)
-            xi = self.formula_12(a_omega, b_omega, omega)
-            
-            # 从预计算的代数变量中获取窑内半径、填充角
-            r_c = algebraic_vars['r_c']
-            theta = algebraic_vars['theta']
-            
-            # 计算料床长度：输入(设备半径, 填充角)，输出(料床长度)
-            Lc = self.formula_14(r_c, theta)
-            
-            # 计算床层高度：输入(设备半径, 填充角)，输出(床层高度)
-            h_current = self.formula_72(r_c, theta)
-            
-            # 2. 获取前一个单元的床层高度
-            h_prev = h_current  # 默认情况：如果是第一个单元，前一个单元的床层高度等于当前单元
-            if index > 0: #若不是第一个单元
-                prev_cell = self.cells[index-1]
-                prev_theta = prev_cell['algebraic_variables'].get('theta', theta) #读取前一个单元的填充角
-                # 计算床层高度：输入(设备半径, 填充角)，输出(床层高度)
-                h_prev = self.formula_72(r_c, prev_theta) #计算前一个单元的床层高度
-            
-            # 3. 构建床层高度列表，包含当前段和前一段的床层高度
-            h_z = [h_prev, h_current]
-            
-            # 4.计算床层高度轴向梯度：输入(床层高度列表)，输出(床层高度轴向梯度)
-            dh_z_dz = self.formula_74(h_z)
-            
-            # 计算料流角：输入(床层高度轴向梯度)，输出(料流角)
-            phi_z = self.formula_73(dh_z_dz)
+        mu_g = self._mu_g
 
-            # 计算固体速度：输入(角速度, 窑倾角, 固体休止角, 设备半径, 料床长度, 料流角)，输出(固体速度)
-            vs = self.formula_13(omega, psi, xi, r_c, Lc, phi_z)
-        else:
-            # 其他情况，预热器,使用默认值
-            vs = algebraic_vars.get('vs')
+        # 计算气相速度与固相速度：调用按区段预先解析的规则句柄（见 _compile_rule_handles）
+        vg = rules['_gas_velocity_fn'](DH, rho_g, mu_g, dP_dz)
+        # 窑内半径 r_c、填充角 θ 沿用第一部分取得的填充几何
+        vs = rules['_solid_velocity_fn'](vg, r_c, theta, sin_half_theta, index, prev_alg)
         
         # 计算固体组分通量（公式25）
-        N_i_s_list = [] #初始化固体组分通量列表
-        for component in solid_components: #遍历所有固体组分
-            C_i_s = C[component] #读取该组分的浓度
-            # 计算固体通量：输入(固体速度, 组分浓度)，输出(固体组分通量)
-            N_i = self.formula_25(vs, C_i_s)
-            N_i_s_list.append(N_i) #将通量添加到N_i_s列表
+        # 固体组分位于 C 的前 9 位，N_i,s = v_s · C_i,s 直接对切片逐项计算
+        N_i_s_list = [vs * C_i_s for C_i_s in C[:9]]
         algebraic_vars['N_s'] = N_i_s_list # 存储以供微分求解复用
 
         # 计算气体总摩尔浓度：输入(浓度字典)，输出(气体总摩尔浓度)
-        real_gas_components = [c for c in gas_components if c != 'C_sus']
-        real_gas_C_dict = {k: C.get(k, 0.0) for k in real_gas_components}
-        cg_real = self.formula_77(real_gas_C_dict)
+        real_gas_components = self._real_gas_components
+        real_gas_C = C[10:]  # 真实气体（不含位于气体段首位的 C_sus）浓度切片
+        cg_real = self.formula_77(real_gas_C)
         
         # 计算气体各组分摩尔分数（公式61）
-        xj_real = [] #初始化摩尔分数列表
-        for component in real_gas_components: #初始化摩尔分数列表
-            C_i_g_t = C[component] #读取该组分的浓度
-            # 计算摩尔分数：输入(组分浓度, 总摩尔浓度)，输出(摩尔分数)
-            x_i = self.formula_61(C_i_g_t, cg_real)
-            xj_real.append(x_i) #将摩尔分数添加到xj列表
+        # xi,g = Ci,g / cg，cg 为 0 时各摩尔分数取 0（与公式61一致）
+        if cg_real == 0:
+            xj_real = [0.0] * len(real_gas_C)
+        else:
+            xj_real = [C_i_g_t / cg_real for C_i_g_t in real_gas_C]
+        algebraic_vars['xj'] = xj_real # 存储以供后续复用
 
+        # 二元扩散系数矩阵（公式24），本单元内各气体组分共用
+        D_ij_real = self.formula_24_matrix(Tg, P, real_gas_components)
+        
+        # 1. 计算浓度梯度 (扩散项必要参数，公式23)，全部气体组分一次性做后向差分
+        gas_C = C[9:]
+        if index > 0: #若不是第一个单元
+            prev_gas_C = prev_C[9:]  # 前一个单元的气体段浓度
+            dC_g_dz = _backward_diff(gas_C, prev_gas_C, cell['delta_z'])
+        else:
+            dC_g_dz = [0.0] * len(gas_components) #入口单元浓度梯度为 0
+        
         # 计算气体组分通量（公式21）
-        N_i_g_list = []
-        for component in gas_components: #遍历所有气体组分，获取索引
-            C_i_g = C[component]
-            # 1. 计算浓度梯度 (扩散项必要参数)
-            # 获取前一个单元的浓度
-            if index > 0: #若不是第一个单元
-                prev_cell = self.cells[index-1] #获取前一个单元
-                prev_C = prev_cell['state_variables']['C']  # 获取前一个单元
-                prev_C_i_g = prev_C[component]  # 读取前一个单元该组分的浓度
-                delta_z = cell['delta_z'] #读取当前单元的空间步长
-                # 计算浓度梯度：输入(当前浓度, 前一浓度, 轴向步长)，输出(浓度梯度)
-                dC_i_g_dz = self.formula_23(C_i_g, prev_C_i_g, delta_z)
-            else:
-                dC_i_g_dz = 0.0 #初始化浓度梯度为 0
+        N_i_g_list = [0.0] * len(gas_components) # 气体组分数固定，按组分下标直接写入
+        for g, component in enumerate(gas_components): #遍历所有气体组分，获取索引
+            C_i_g = gas_C[g]
+            dC_i_g_dz = dC_g_dz[g]
  
             # 2. 计算通量 (C_sus纯对流，其他气体含扩散)
             if component == 'C_sus':
                 # C_sus 视为悬浮颗粒，使用纯对流公式 (formula_25)
-                N_i = self.formula_25(vg, C_i_g)
+                N_i = formula_25(vg, C_i_g)
             else:
                 # 常规气体使用对流+扩散公式 (formula_21)，使用真实气体组分列表和摩尔分数
                 # formula_21 内部会调用 formula_22 计算有效扩散系数
                 if component in real_gas_components:
-                    real_index = real_gas_components.index(component)
+                    real_index = g - 1  # 气体段首位为 C_sus，真实气体索引相差 1
                     # 传入 real_gas_components, xj_real, real_index 计算有效扩散系数
-                    N_i = self.formula_21(vg, C_i_g, Tg, P, real_gas_components, xj_real, dC_i_g_dz, real_index)
+                    N_i = self.formula_21(vg, C_i_g, Tg, P, real_gas_components, xj_real, dC_i_g_dz, real_index, D_ij_real)
 
-            N_i_g_list.append(N_i) 
+            N_i_g_list[g] = N_i
         algebraic_vars['N_g'] = N_i_g_list # 存储以供微分求解复用
             
 
@@ -2129,44 +2436,15 @@ class CementProductionModel:
         algebraic_vars['H_tilde_g'] = H_tilde_g
   
 #六、气体比热容与对流换热计算      
-        # 计算单段总体积：输入(总横截面积, 轴向步长)，输出(单段总体积)
-        V_delta = self.formula_58(algebraic_vars.get('A_t', 3.1416), cell['delta_z'])
-        
-        # 5. 计算各气体组分的摩尔热容（公式6）
-        cp_i_list = [] #初始化气体组分摩尔热容列表
-        M_i_list = [] #初始化气体组分摩尔质量列表
-        n_i_list = [] #初始化气体组分摩尔数列表
-        
-        for component in gas_components: #遍历所有气体组分
-            # 获取组分的热容系数
-            if component in self.constants['molar_heat_capacity']: #判断是否有热容系数数据
-                coeffs = self.constants['molar_heat_capacity'][component] #读取热容系数
-            else:
-                coeffs = {'C0': 0.0, 'C1': 0.0, 'C2': 0.0}
-            
-            C0 = coeffs['C0']
-            C1 = coeffs['C1']
-            C2 = coeffs['C2']
-
-            # 计算摩尔热容：输入(热容系数C0, C1, C2, 当前温度T)，输出(摩尔热容)
-            cp_i = self.formula_6(C0, C1, C2, Tg)
-            cp_i_list.append(cp_i)
-            
-            # 获取摩尔质量
-            M_i = self.constants['gas_properties'][component]['molar_mass'] #读取摩尔质量
-            M_i_list.append(M_i) #添加到摩尔质量列表
-
-            C_i_g_t = C[component] #读取该组分的浓度
-            # 计算气体组分摩尔数：输入(单段总体积, 组分浓度)，输出(气体组分摩尔数)
-            n_i = self.formula_57_gas(V_delta, C_i_g_t)
-            n_i_list.append(n_i) #添加到摩尔数列表
-
-        # 计算气体比热容：输入(气体组分摩尔热容列表, 气体组分摩尔质量列表, 气体组分摩尔数列表)，输出(气体比热容)
-        cp_g = self.formula_81(cp_i_list, M_i_list, n_i_list)
+        # 单段总体积 V_delta 已在第三部分取得（公式58，预计算）
+        
+        # 5. 计算气体比热容（公式6 各组分摩尔热容、公式57_gas 摩尔数、公式81 比热容）
+        # 纯数值内核：热容系数、摩尔质量均为按组分顺序预先整理的常量表，浓度取气体段切片
+        cp_g = _gas_specific_heat(self._cp_coeffs_g, self._molar_mass_g, gas_moles, Tg)
         algebraic_vars['cp_g'] = cp_g #存储气体比热容
         
         # 7. 计算普朗特数和对流换热（使用差异化配置中的对流换热公式）
-        mu_g = self.parameters['mu_g']  # 气体平均粘度，Pa·s
+        # 气体平均粘度 mu_g (Pa·s) 沿用第四部分读取的值
 
         # 计算气体热导率：输入(气体温度)，输出(气体热导率)
         k_g = self.formula_20(Tg)
@@ -2175,43 +2453,33 @@ class CementProductionModel:
         Pr = self.formula_32(cp_g, mu_g, k_g)
         algebraic_vars['Pr'] = Pr #存储普朗特数
 
-        # 辐射换热
-        sigma = self.constants.get('sigma', 5.67e-8)
-        epsilon_s = self.parameters.get('epsilon_s', 0.9)
-        
-        # 计算气体总摩尔浓度 cg
-        real_gas_components = [c for c in gas_components if c != 'C_sus']
-        real_gas_C_dict = {k: C.get(k, 0.0) for k in real_gas_components}
-        cg_real = self.formula_77(real_gas_C_dict)
-        
-        # 计算摩尔分数 (防止 cg=0 除零错误)
-        xH2O = C.get('H2O', 0.0) / cg_real if cg_real > 1e-12 else 0.0
-        xCO2 = C.get('CO2', 0.0) / cg_real if cg_real > 1e-12 else 0.0
-        
-        # 计算气体发射率 epsilon_g (公式53)
-        epsilon_g = self.formula_53(Tg, P, xH2O, xCO2, r_c)
-        # 计算气固综合发射率 epsilon_gs (公式80)
-        epsilon_gs = self.formula_80(epsilon_g, epsilon_s)
-        
-        # 使用差异化配置中的对流换热公式
-        heat_transfer_rule = rules.get('heat_transfer', 'formula_35') #从执行规则中获取对流换热公式
-        if isinstance(heat_transfer_rule, str) and heat_transfer_rule == 'formula_35':
-            # 分解炉对流换热（公式35）
-            # 完整使用公式35计算
-            dp = self.constants.get('d_p', 3e-5)  # 颗粒直径
-            
-            # 计算气体密度（公式11）
-            gas_C = {component: C[component] for component in gas_components}
-            # 计算气体密度：输入(气体性质字典, 气体浓度字典)，输出(气体密度)
-            rho_g = self.formula_11(self.constants['gas_properties'], gas_C)
-  
-            # 从预计算的代数变量中获取窑内半径、填充角
-            r_c = algebraic_vars['r_c']
-            theta = algebraic_vars['theta']
+        # 使用差异化配置中的对流换热公式（预热器无对流/辐射换热，句柄为 None，整块跳过）
+        convection_fn = rules['_heat_transfer_fn'] #按区段预先解析的对流换热句柄
+        if convection_fn is not None:
+            # 辐射换热
+            sigma = self.K.sigma
+            epsilon_s = self._epsilon_s
+
+            # 计算摩尔分数 (防止 cg=0 除零错误)，直接取公式61已算好的真实气体摩尔分数
+            # （xj_real 按真实气体顺序排列，索引为组分索引减 10）
+            if cg_real > 1e-12:
+                xH2O = xj_real[comp_idx['H2O'] - 10]
+                xCO2 = xj_real[comp_idx['CO2'] - 10]
+            else:
+                xH2O = 0.0
+                xCO2 = 0.0
+
+            # 计算气体发射率 epsilon_g (公式53)
+            epsilon_g = self.formula_53(Tg, P, xH2O, xCO2, r_c)
+            # 计算气固综合发射率 epsilon_gs (公式80)
+            epsilon_gs = self.formula_80(epsilon_g, epsilon_s)
+
+            # 两种对流换热公式共用的几何量与辐射换热，只计算一次
+            # 气体密度 rho_g（公式11）、窑内半径 r_c、填充角 θ 均沿用本函数前文已取得的值
             # 计算有效直径：输入(设备半径, 填充角)，输出(有效直径)
-            De = self.formula_34(r_c, theta)  
+            De = self.formula_34(r_c, theta, sin_half_theta)
             # 计算料床长度：输入(设备半径, 填充角)，输出(料床长度)
-            Lc = self.formula_14(r_c, theta)
+            Lc = self.formula_14(r_c, theta, sin_half_theta)
 
             # 计算气固换热面积：输入(料床长度, 轴向步长)，输出(换热面积)
             Ags = self.formula_40(Lc, cell['delta_z'])
@@ -2219,69 +2487,28 @@ class CementProductionModel:
             # 计算轴向雷诺数：输入(气体密度, 气体速度, 有效直径, 气体粘度)，输出(轴向雷诺数)
             ReD = self.formula_33(rho_g, vg, De, mu_g)
 
-            # 计算对流换热量：输入(气体热导率, 颗粒直径, 轴向雷诺数, 普朗特数)，输出(对流换热量)
-            Qgscv = self.formula_35(k_g, dp, ReD, Pr, Ags, Tg, Ts)
+            # 计算辐射换热量（公式41）
             Qgsrad = self.formula_41(sigma, Ags, epsilon_gs, Tg, Ts)
 
-            algebraic_vars['Qgscv'] = Qgscv #存储分解炉对流换热量
-            algebraic_vars['Qgsrad'] = Qgsrad
-            algebraic_vars['Ags'] = Ags
-            algebraic_vars['ReD'] = ReD #存储轴向雷诺数
-
-        elif isinstance(heat_transfer_rule, str) and heat_transfer_rule == 'formula_39':
-            # 回转窑对流换热（公式39）
-            # 从预计算的代数变量中获取窑内半径、填充角
-            r_c = algebraic_vars['r_c']
-            theta = algebraic_vars['theta']
-            # 计算料床长度：输入(设备半径, 填充角)，输出(料床长度)
-            Lc = self.formula_14(r_c, theta)
+            # 计算对流换热量：公式35（分解炉）或公式39（回转窑，同时存储对流换热系数 beta）
+            Qgscv = convection_fn(algebraic_vars, k_g, Pr, ReD, Ags, De, rho_g, mu_g, eta, Tg, Ts)
 
-            # 计算气固换热面积：输入(料床长度, 轴向步长)，输出(换热面积)
-            Ags = self.formula_40(Lc, cell['delta_z'])
-
-            # 计算有效直径：输入(设备半径, 填充角)，输出(有效直径)
-            De = self.formula_34(r_c, theta)
-
-            # 计算气体密度：输入(气体性质字典, 气体浓度字典)，输出(气体密度)
-            rho_g = self.formula_11(self.constants['gas_properties'], C)
-
-            # 计算轴向雷诺数：输入(气体密度, 气体速度, 有效直径, 气体粘度)，输出(轴向雷诺数)
-            ReD = self.formula_33(rho_g, vg, De, mu_g)
-
-            # 计算旋转雷诺数：输入(气体密度, 有效直径, 气体粘度, 角速度)，输出(旋转雷诺数)
-            Re_omega = self.formula_36(rho_g, De, mu_g, self.control_variables.get('omega', 0.4189))
-
-            # 计算努塞尔数：输入(轴向雷诺数, 旋转雷诺数, 填充率)，输出(努塞尔数)
-            Nu = self.formula_37(ReD, Re_omega, eta)
-            
-            # 计算对流换热系数：输入(气体热导率, 有效直径, 努塞尔数)，输出(对流换热系数)
-            beta = self.formula_38(k_g, De, Nu)
-            
-            # 计算对流换热量：输入(气固换热面积, 对流换热系数, 气体温度, 固体温度)，输出(对流换热量)
-            Qgscv = self.formula_39(Ags, beta, Tg, Ts)
-            Qgsrad = self.formula_41(sigma, Ags, epsilon_gs, Tg, Ts)
-            
-            algebraic_vars['Qgscv'] = Qgscv #存储回转窑对流换热量
+            # 存储换热中间量，微分求解直接读取，不再重算
+            algebraic_vars['Qgscv'] = Qgscv #存储对流换热量
             algebraic_vars['Qgsrad'] = Qgsrad
             algebraic_vars['Ags'] = Ags
-            algebraic_vars['beta'] = beta #存储对流换热系数
-            algebraic_vars['ReD'] = ReD
+            algebraic_vars['ReD'] = ReD #存储轴向雷诺数
+            algebraic_vars['epsilon_gs'] = epsilon_gs #存储气固综合发射率
 
         # 计算热传导 Q_tilde (需要温度梯度)
-        # 获取前一单元温度 (处理边界：如果是第一个单元相等)
-        prev_Tg = Tg
-        prev_Ts = Ts
-        if index > 0:
-            prev_cell = self.cells[index-1]
-            prev_Tg = prev_cell['algebraic_variables'].get('Tg', Tg)
-            prev_Ts = prev_cell['algebraic_variables'].get('Ts', Ts)
+        # 前一单元温度 prev_Tg、prev_Ts 已在第二部分读取 (入口单元取自身温度)
             
-        # 计算温度梯度 (公式43)
-        dTg_dz = self.formula_43([prev_Tg, Tg])
-        dTs_dz = self.formula_43([prev_Ts, Ts])
+        # 计算温度梯度 (公式43)：(T(z_k) - T(z_k-1)) / Δz，两点差分直接相减
+        dz = self.dz
+        dTg_dz = (Tg - prev_Tg) / dz
+        dTs_dz = (Ts - prev_Ts) / dz
         
-        # 计算导热系数与热通量
-        k_g = self.formula_20(Tg)
+        # 计算热通量，气体热导率 k_g 沿用第六部分在 Tg 下的计算结果（公式20）
         Q_tilde_g = self.formula_54(k_g, dTg_dz)  # 气体热传导 (公式54)
         Q_tilde_s = self.formula_55(dTs_dz)       # 固体热传导 (公式55)
 
@@ -2292,44 +2519,7 @@ class CementProductionModel:
 #七、内能密度约束计算
         # 9. 计算内能密度约束，使用差异化配置中的公式
         
-        # 1. 计算固体总焓 Hs
-        H_s = 0.0
-        solid_moles = {} # 构建摩尔数字典，供后续体积公式使用
-        
-        # 遍历固体组分，复用 Part 3 计算好的 h_i_s
-        for idx, comp in enumerate(solid_components):
-            conc = C.get(comp, 0.0)
-            # 计算固体组分摩尔数：输入(单段总体积, 组分浓度)，输出(固体组分摩尔数)
-            # 调用 formula_57
-            n_i = self.formula_57(V_delta, conc)
-            solid_moles[comp] = n_i
-            
-            # 累加总焓：H = Σ (n_i * h_i)
-            H_s += n_i * h_i_s[idx]
-
-        # 2. 计算气体总焓 Hg
-        H_g = 0.0
-        gas_moles = {} # 构建摩尔数字典，供后续体积公式使用
-        real_gas_moles = {}
-
-        # 遍历气体组分，复用 Part 3 计算好的 h_i_g
-        for idx, comp in enumerate(gas_components):
-            conc = C.get(comp, 0.0)
-            # 计算气体组分摩尔数：输入(单段总体积, 组分浓度)，输出(气体组分摩尔数)
-            # 调用 formula_57_gas
-            n_i = self.formula_57_gas(V_delta, conc)
-            gas_moles[comp] = n_i
-            
-            # 累加总焓：H = Σ (n_i * h_i)
-            H_g += n_i * h_i_g[idx]
-
-            # 体积计算分流逻辑
-            if comp == 'C_sus':
-                # C_sus 归入固体体积计算
-                solid_moles[comp] = n_i
-            else:
-                # 真实气体归入气体体积计算
-                real_gas_moles[comp] = n_i
+        # 固体、气体总焓 H = Σ (n_i * h_i) 及各组分摩尔数已在第三部分与摩尔焓一并算出
         
         # 计算单位体积焓：输入(总焓, 单段总体积)，输出(单位体积焓)
         H_hat_s = self.formula_63(H_s, V_delta)
@@ -2337,21 +2527,13 @@ class CementProductionModel:
         # 计算单位体积焓：输入(总焓, 单段总体积)，输出(单位体积焓)
         H_hat_g = self.formula_64(H_g, V_delta)
         
-        # 计算气体体积：输入(气体常数, 温度, 压力, 气体组分摩尔数)，输出(气体体积)
-        V_g = self.formula_7(self.constants['R'], Tg, P, real_gas_moles)
+        # 体积计算分流逻辑：气体段首位的 C_sus 归入固体体积计算，其余真实气体归入气体体积计算
+        # 计算气体体积：输入(气体常数, 温度, 压力, 真实气体组分摩尔数)，输出(气体体积)
+        V_g = self.formula_7(self.K.R, Tg, P, gas_moles[1:])
         
-        # 调取固体体积所需参数
-        solid_molar_mass = {comp: self.constants['solid_properties'][comp]['molar_mass'] for comp in solid_components if comp in self.constants['solid_properties']}
-        solid_density = {comp: self.constants['solid_properties'][comp]['density'] for comp in solid_components if comp in self.constants['solid_properties']}
-        
-        # 补充 C_sus 属性
-        if 'C_sus' in self.constants['gas_properties']:
-             props = self.constants['gas_properties']['C_sus']
-             solid_molar_mass['C_sus'] = props['molar_mass']
-             solid_density['C_sus'] = props['density']
-                                                
         # 计算固体体积：输入(固体组分摩尔质量, 固体组分密度, 固体组分摩尔数)，输出(固体体积)
-        V_s = self.formula_8(solid_molar_mass, solid_density, solid_moles)
+        # 摩尔质量、密度按 C[:10] 顺序排列（含 C_sus 属性，见 define_constants）
+        V_s = self.formula_8(self._solid_M, self._solid_rho, solid_moles + gas_moles[:1])
         
         # 计算固体体积分数：输入(固体体积, 单段总体积)，输出(固体体积分数)
         V_s_fraction = self.formula_66(V_s, V_delta)
@@ -2393,17 +2575,79 @@ class CementProductionModel:
         #返回当前单元的所有代数变量
         return algebraic_vars
     
+    def _inlet_solid_fluxes(self, A_t):
+        # 入口边界固体组分通量 (Flux = Flow / Area)
+        # 输入：A_t（入口截面积）；组分及其摩尔质量按固体段缓存元组顺序读取
+        # 输出：按组分顺序排列的入口通量列表 mol/(m²·s)
+        feed_total = self.control_variables['solid_feed']['total_rate'] # g/s
+        feed_comp = self.control_variables['solid_feed']['composition']
+        fuel_total = self.control_variables['fuel']['rate'] # g/s
+        fuel_comp = self.control_variables['fuel']['composition']
+        
+        inlet_fluxes = []
+        for component, molar_mass in zip(self._solid_components, self._molar_mass_s):
+            # A. 生料贡献
+            mass_frac_feed = feed_comp.get(component, 0.0)
+            # B. 燃料贡献
+            mass_frac_fuel = fuel_comp.get(component, 0.0)
+            # C. 合并质量流率
+            total_mass_rate_in = (feed_total * mass_frac_feed) + (fuel_total * mass_frac_fuel)
+            # D. 计算摩尔通量
+            # 计算总摩尔流率 (mol/s)
+            # 使用公式56: n_dot = m_dot / M
+            inlet_molar_rate = self.formula_56(total_mass_rate_in, molar_mass)
+            # 计算入口通量 mol/(m²·s)
+            inlet_fluxes.append(inlet_molar_rate / A_t)
+        return inlet_fluxes
+    
+    def _inlet_gas_fluxes(self, A_t):
+        # 入口边界气体组分通量（气体进料 + 燃料中的气体成分）
+        # 输入：A_t（入口截面积）；组分及其摩尔质量（C_sus 取 gas_properties）按气体段缓存元组顺序读取
+        # 输出：按组分顺序排列的入口通量列表 mol/(m²·s)
+        gas_feed_total_rate = self.control_variables['gas_feed']['total_rate'] # mol/s
+        gas_feed_comp = self.control_variables['gas_feed']['composition']
+        fuel_rate_mass = self.control_variables['fuel']['rate'] # g/s
+        fuel_comp = self.control_variables['fuel']['composition'] # 质量分数
+        
+        inlet_fluxes = []
+        for component, molar_mass in zip(self._gas_components, self._molar_mass_g):
+            # 1. 气体进料贡献
+            # 获取摩尔分数
+            mole_frac_gas = gas_feed_comp.get(component, 0.0)
+            # 计算摩尔流率
+            rate_from_gas = gas_feed_total_rate * mole_frac_gas # mol/s
+
+            # 2. 燃料进料贡献
+            mass_frac_fuel = fuel_comp.get(component, 0.0)
+            
+            rate_from_fuel = 0.0
+            if mass_frac_fuel > 0:
+                # 计算该组分的质量流率 g/s
+                mass_rate_i = fuel_rate_mass * mass_frac_fuel
+                # formula_56: n_dot = m_dot / M  将 g/s 转换为 mol/s
+                rate_from_fuel = self.formula_56(mass_rate_i, molar_mass)
+            # 计算入口摩尔流率 mol/s
+            total_inlet_molar_rate = rate_from_gas + rate_from_fuel
+            
+            # 计算入口通量 mol/(m²·s)\A_t 为入口截面积
+            inlet_fluxes.append(total_inlet_molar_rate / A_t)
+        return inlet_fluxes
+    
     def _solve_differential_equations(self, cell, rules, algebraic_vars):
         # 求解微分方程：当前有限体积单元、单元执行规则、前序代数计算得到的变量
         # 计算浓度变化率 dC/dt 和内能变化率 dU/dt
-        dC_dt = {} #存储各组分的浓度时间变化率
+        comp_idx = self._comp_idx
+        dC_dt = [0.0] * len(self._components) #存储各组分的浓度时间变化率（按组分顺序，与 C 逐项对应）
         dU_dt = 0.0  # 初始化为浮点数，因为U_hat是标量值
         
         index = cell['index'] #获取当前单元的索引
         
         # 获取当前单元的状态变量
         state_vars = cell['state_variables'] #获取单元的状态变量字典
-        C = state_vars['C']  # 组分浓度向量
+        C = state_vars['C']  # 组分浓度向量（按组分顺序的列表）
+        # 组分循环内调用的公式绑定为局部变量，省去逐次属性查找
+        formula_28 = self.formula_28
+        formula_30 = self.formula_30
         
         # 获取单元所属设备类型
         section = cell['device_type']
@@ -2411,54 +2655,32 @@ class CementProductionModel:
         # 获取从代数计算得到的约束变量
         Tg = algebraic_vars.get('Tg', 1000.0)  # 气体温度，从代数计算得到
         Ts = algebraic_vars.get('Ts', 1000.0)  # 固体温度，从代数计算得到
-        P = algebraic_vars.get('P', self.constants['P0'])  # 压力，从代数计算得到
+        P = algebraic_vars.get('P', self.K.P0)  # 压力，从代数计算得到
         
-        # 获取所有组分列表
-        stoichiometric_matrix = self.constants['stoichiometric_matrix'] #从化学计量矩阵中获取组分信息
-        all_components = stoichiometric_matrix['components'] #提取所有 15 个组分的名称列表
-        solid_components = all_components[:9]
-        gas_components = all_components[9:]
+        # 获取固体、气体组分列表（预先缓存，见 _cache_constants）
+        solid_components = self._solid_components
+        gas_components = self._gas_components
 
 #一、反应源项计算        
         # 1. 计算反应源项（公式27）
         # 基于质量守恒定律，结合反应速率和生成速率计算
         
-        # 根据差异化配置获取当前设备的反应列表
-        reactions = rules.get('reactions', [])
-        
-        # 如果没有指定反应列表，根据设备类型设置默认反应
-        if not reactions: #判断反应列表是否为空
-            if section == 'calciner':
-                reactions = ['r1', 'r6', 'r7', 'r8', 'r9', 'r10', 'r11']  # 分解炉仅r1分解反应
-            elif section == 'kiln':
-                reactions = ['r1', 'r2', 'r3', 'r4', 'r5', 'r6', 'r7', 'r8', 'r9', 'r10', 'r11']  # 回转窑r2~r5熟料反应
-            else:
-                reactions = []  # 其他设备无反应
+        # 当前设备激活的反应已按区段预先筛选并换算为反应下标（见 spatial_discretization / _select_active_reactions），
+        # 以参数形式传入反应源项计算，不改动 self.constants
+        active_rxn_js = self._active_rxn_js_by_section[section]
         
-        # 获取全局反应系数表
-        all_reaction_coeffs = self.constants['reaction_rate_coefficients']
-
-        # 根据当前设备的 reactions 列表，生成局部的激活反应字典
-        if reactions:
-            active_reactions_dict = {r: all_reaction_coeffs[r] for r in reactions if r in all_reaction_coeffs}
-        else:
-            active_reactions_dict = {}
-        
-        #计算关键气体组分的分压
-        P_i_dict = {}
-        R = self.constants['R']
-        # 仅遍历需要的组分（H2O, CO2）
-        for comp in ['H2O', 'CO2']:
-            # 获取该组分的摩尔浓度 
-            conc = C.get(comp, 0.0)
+        #计算关键气体组分的分压，按组分顺序排列，供速率内核按下标读取
+        P_i = [0.0] * len(C)
+        R = self.K.R
+        # 仅计算需要的组分（H2O, CO2）
+        for k in self._pp_idx:
             # 计算分压 (Pa): Pi = Ci * R * Tg
-            partial_pressure = conc * R * Tg
-            P_i_dict[comp] = partial_pressure
+            P_i[k] = C[k] * R * Tg
 
-        C_i_dict = C  # 组分浓度字典，当前状态变量
+        C_i = C  # 组分浓度列表，当前状态变量
 
-        # 计算反应源项：输入(T, 组分分压字典, 组分浓度字典，激活反应字典)，输出(固体相生成速率, 气体相生成速率)
-        Rs, Rg, rxn_rates_molar = self._calculate_reaction_source(Tg, Ts, P_i_dict, C_i_dict, active_reactions_dict)
+        # 计算反应源项：输入(T, 组分分压列表, 组分浓度列表，激活反应下标)，输出(固体相生成速率, 气体相生成速率, 激活反应速率)
+        Rs, Rg, rxn_rates = self._calculate_reaction_source(Tg, Ts, P_i, C_i, active_rxn_js)
 
 #二、浓度变化率计算     
         delta_z = cell['delta_z']
@@ -2468,104 +2690,49 @@ class CementProductionModel:
         # 固体组分处理
         N_i_s_current_list = algebraic_vars['N_s']
 
+        # 上游相邻单元的代数变量字典只取一次，通量、焓通量、导热通量均由此读取
+        prev_alg = self.cells[index-1]['algebraic_variables'] if index > 0 else None
+
+        # 获取前一单元通量 (prev_N)
+        if index > 0: #若不是第一个单元
+            # 直接复用前一单元代数变量中存储的通量
+            prev_N_s_list = prev_alg['N_s']
+        else:
+            # 入口边界：需独立计算 (Flux = Flow / Area)
+            prev_N_s_list = self._inlet_solid_fluxes(A_t)
+        
+        # 计算固体通量梯度（公式29），全部固体组分一次性做后向差分
+        dN_s_dz = _backward_diff(N_i_s_current_list, prev_N_s_list, delta_z)
+        
         for i, component in enumerate(solid_components): #遍历所有固体组分，逐个计算浓度变化率
-            # 获取代数计算中已算好的当前单元固体通量列表
-            # 1. 直接复用当前通量
-            N_i_s = N_i_s_current_list[i]
-            
-            # 2. 获取前一单元通量 (prev_N)
-            if index > 0: #若不是第一个单元
-                # 直接复用前一单元代数变量中存储的通量
-                prev_cell = self.cells[index-1] #获取前一个单元
-                prev_N_i_s = prev_cell['algebraic_variables']['N_s'][i]
-            else:
-                # 入口边界：需独立计算 (Flux = Flow / Area)
-                # A. 生料贡献
-                feed_total = self.control_variables['solid_feed']['total_rate'] # g/s
-                feed_comp = self.control_variables['solid_feed']['composition']
-                mass_frac_feed = feed_comp.get(component, 0.0)
-                # B. 燃料贡献
-                fuel_total = self.control_variables['fuel']['rate'] # g/s
-                fuel_comp = self.control_variables['fuel']['composition']
-                mass_frac_fuel = fuel_comp.get(component, 0.0)
-                # C. 合并质量流率
-                total_mass_rate_in = (feed_total * mass_frac_feed) + (fuel_total * mass_frac_fuel)
-                # D. 计算摩尔通量
-                molar_mass = self.constants['solid_properties'][component]['molar_mass']
-                
-                # 计算总摩尔流率 (mol/s)
-                # 使用公式56: n_dot = m_dot / M
-                inlet_molar_rate = self.formula_56(total_mass_rate_in, molar_mass)
-                # 计算入口通量 mol/(m²·s)
-                prev_N_i_s = inlet_molar_rate / A_t
-            
-            # 计算固体通量梯度：输入(当前单元通量, 前一单元通量, 轴向步长)，输出(通量梯度)
-            dN_i_s_dz = self.formula_29(N_i_s, prev_N_i_s, delta_z)
-            
             # 计算固体浓度变化率：输入(通量梯度, 反应源项)，输出(浓度变化率)
-            dC_dt[component] = self.formula_28(dN_i_s_dz, Rs[i])
+            dC_dt[comp_idx[component]] = formula_28(dN_s_dz[i], Rs[i])
         
         # --- 气体组分处理 ---
         # 获取代数计算中已算好的当前单元气体通量列表 (已包含扩散计算)
         N_i_g_current_list = algebraic_vars['N_g']
         
+        # 获取前一单元通量 (prev_N)
+        if index > 0:
+            prev_N_g_list = prev_alg['N_g']
+        else:
+            # 若是第一个单元(index=0)，计算入口边界通量
+            prev_N_g_list = self._inlet_gas_fluxes(A_t)
+        
+        # 计算气体通量梯度（公式31），全部气体组分一次性做后向差分
+        dN_g_dz = _backward_diff(N_i_g_current_list, prev_N_g_list, delta_z)
+        
         for i, component in enumerate(gas_components): #遍历所有气体组分，逐个计算浓度变化率
-            # 1. 直接复用当前通量
-            N_i_g = N_i_g_current_list[i]
-
-            # 2. 获取前一单元通量 (prev_N)
-            if index > 0:
-                prev_cell = self.cells[index-1] #获取前一个单元
-                prev_N_i_g = prev_cell['algebraic_variables']['N_g'][i]
-            else:
-                # 若是第一个单元(index=0)，计算入口边界通量
-                # 1. 气体进料贡献
-                gas_feed_total_rate = self.control_variables['gas_feed']['total_rate'] # mol/s
-                gas_feed_comp = self.control_variables['gas_feed']['composition']
-                # 获取摩尔分数
-                mole_frac_gas = gas_feed_comp.get(component, 0.0)
-                # 计算摩尔流率
-                rate_from_gas = gas_feed_total_rate * mole_frac_gas # mol/s
-
-                # 2. 燃料进料贡献
-                fuel_rate_mass = self.control_variables['fuel']['rate'] # g/s
-                fuel_comp = self.control_variables['fuel']['composition'] # 质量分数
-                mass_frac_fuel = fuel_comp.get(component, 0.0)
-                
-                rate_from_fuel = 0.0
-                if mass_frac_fuel > 0:
-                    # 获取摩尔质量 (C_sus 在 gas_properties 中)
-                    if component in self.constants['gas_properties']:
-                        molar_mass = self.constants['gas_properties'][component]['molar_mass']
-                    else:
-                         molar_mass = self.constants['solid_properties'].get(component, {}).get('molar_mass')
-                    
-                    # 计算该组分的质量流率 g/s
-                    mass_rate_i = fuel_rate_mass * mass_frac_fuel
-                    # formula_56: n_dot = m_dot / M  将 g/s 转换为 mol/s
-                    rate_from_fuel = self.formula_56(mass_rate_i, molar_mass)
-                # 计算入口摩尔流率 mol/s
-                total_inlet_molar_rate = rate_from_gas + rate_from_fuel
-                
-                # 计算入口通量 mol/(m²·s)\A_t 为入口截面积
-                prev_N_i_g = total_inlet_molar_rate / A_t
-            
-            # 计算气体通量梯度：输入(当前单元通量, 前一单元通量, 轴向步长)，输出(通量梯度)
-            dN_i_g_dz = self.formula_31(N_i_g, prev_N_i_g, delta_z)
-            
             # 计算气体浓度变化率：输入(通量梯度, 反应源项)，输出(浓度变化率)
-            dC_dt[component] = self.formula_30(dN_i_g_dz, Rg[i])
+            dC_dt[comp_idx[component]] = formula_30(dN_g_dz[i], Rg[i])
 
 #三、内能变化率计算            
         # 3. 计算内能变化率 dŨ/dt
-        # 组件列表可用
-        solid_components = self.constants['stoichiometric_matrix']['components'][:9]
-        gas_components = self.constants['stoichiometric_matrix']['components'][9:]
+        # 组件列表沿用函数开头取得的 solid_components / gas_components
 
         # 准备几何与辅助代数变量 
-        # 确保从 algebraic_vars 中获取几何参数
-        A_t = algebraic_vars.get('A_t')
-        V_delta = self.formula_58(A_t, cell['delta_z'])
+        # 单段总体积（公式58）只取决于设备截面积与段长，取预计算值（见 _cache_geometry）
+        V_delta = self._geom[section]['V_delta']
 
         # 获取对流\辐射换热
         Qgsrad = algebraic_vars.get('Qgsrad', 0.0)
@@ -2587,7 +2754,6 @@ class CementProductionModel:
         
         if index > 0:
             # === 情况 A: 内部单元，继承上游数据 (保持不变) ===
-            prev_alg = self.cells[index-1]['algebraic_variables']
             # 获取前一单元存储的焓通量
             H_s_prev = prev_alg.get('H_tilde_s', H_tilde_s)
             H_g_prev = prev_alg.get('H_tilde_g', H_tilde_g)
@@ -2601,7 +2767,7 @@ class CementProductionModel:
         else:
             # === 情况 B: 入口边界 (i=0)，必须重新计算进料焓通量 ===
             # 1. 准备基础热力学参数
-            T0 = self.constants['T0']
+            T0 = self.K.T0
             T_solid_in = self.control_variables['solid_feed']['temperature']
             T_gas_in = self.control_variables['gas_feed']['temperature']
             
@@ -2611,8 +2777,8 @@ class CementProductionModel:
             fuel_feed = self.control_variables['fuel']
             
             # --- 2. 计算固体入口焓通量 H_s_prev ---
-            # H_in = Σ (N_in * h(T_in))
-            for component in solid_components:
+            # H_in = Σ (N_in * h(T_in))，摩尔质量按固体段缓存元组顺序读取
+            for component, molar_mass in zip(solid_components, self._molar_mass_s):
                 # [2.1] 重算该组分的入口物质通量 (N_in)
                 # A. 生料贡献
                 mass_frac_feed = solid_feed['composition'].get(component, 0.0)
@@ -2625,7 +2791,6 @@ class CementProductionModel:
                 # C. 总质量流率并转换为摩尔通量
                 total_mass_rate = rate_feed + rate_fuel
                 if total_mass_rate > 0:
-                    molar_mass = self.constants['solid_properties'][component]['molar_mass']
                     # 调用公式56: 质量流率 -> 摩尔流率
                     n_dot_in = self.formula_56(total_mass_rate, molar_mass)
                     # 通量 = 流率 / 截面积
@@ -2649,7 +2814,7 @@ class CementProductionModel:
                     H_s_prev += N_in * h_i_in
 
             # --- 3. 计算气体入口焓通量 H_g_prev ---
-            for component in gas_components:
+            for component, mm in zip(gas_components, self._molar_mass_g):
                 # [3.1] 重算该组分的入口物质通量 (N_in)
                 # A. 气体进料贡献
                 mole_frac_gas = gas_feed['composition'].get(component, 0.0)
@@ -2658,13 +2823,7 @@ class CementProductionModel:
                 # B. 燃料挥发分贡献
                 mass_frac_fuel = fuel_feed['composition'].get(component, 0.0)
                 if mass_frac_fuel > 0:
-                    # 获取摩尔质量
-                    if component in self.constants['gas_properties']:
-                        mm = self.constants['gas_properties'][component]['molar_mass']
-                    else:
-                        mm = self.constants['solid_properties'].get(component, {}).get('molar_mass', 1.0)
-                    
-                    # 质量流率 -> 摩尔流率
+                    # 质量流率 -> 摩尔流率（摩尔质量 mm 按气体段缓存元组顺序读取）
                     rate_from_fuel = self.formula_56(fuel_feed['rate'] * mass_frac_fuel, mm)
                 else:
                     rate_from_fuel = 0.0
@@ -2697,55 +2856,20 @@ class CementProductionModel:
         dU_dt_gas = 0.0
         
 
-        # 计算反应焓变 (Jsg)
-        # 气相反应: r6, r7, r8 (燃烧)
-        gas_rxn_keys = ['r6', 'r7', 'r8']
-        # 固相/表面反应: r1-r5 (分解/化合), r9-r11 (碳燃烧/气化)
-        solid_rxn_keys = ['r1', 'r2', 'r3', 'r4', 'r5', 'r9', 'r10', 'r11']
-        
-        # 筛选速率字典
-        rates_g = {k: v for k, v in rxn_rates_molar.items() if k in gas_rxn_keys}
-        rates_s = {k: v for k, v in rxn_rates_molar.items() if k in solid_rxn_keys}
-        
-        # 分别调用 formula_52 计算焓变 (J/m^3s)
-        # 注意: formula_52 返回的是 J_sg (焓变). 放热 dH<0 -> J_sg < 0.
-        J_sg_g = self.formula_52(rates_g, self.constants['reaction_enthalpies'])
-        J_sg_s = self.formula_52(rates_s, self.constants['reaction_enthalpies'])
-
-        energy_eq = rules.get('energy_eq')
-        if energy_eq is None:
-            # === 预热器：纯输运模式 (无能量方程配置) ===
-            # 公式: dU/dt = -dH/dz
-
-            # 当前单元焓通量
-            H_s_curr = algebraic_vars.get('H_tilde_s', 0.0)
-            H_g_curr = algebraic_vars.get('H_tilde_g', 0.0)
-            
-            # 构造列表并调用 formula_70
-            H_s_list = [H_s_prev, H_s_curr]
-            H_g_list = [H_g_prev, H_g_curr]
-            # 计算焓梯度
-            dH_s_dz = self.formula_70(H_s_list, delta_z)
-            dH_g_dz = self.formula_70(H_g_list, delta_z)
-            
-            dU_dt_solid = -dH_s_dz
-            dU_dt_gas = -dH_g_dz
-            dU_dt_total = dU_dt_solid + dU_dt_gas
-        
-        # 判断：分解炉和回转窑使用双方程 (List类型且包含公式44,45)
-        elif isinstance(energy_eq, list) and len(energy_eq) >= 2:
-            # === 回转窑：双方程独立求解 ===
-            # 公式44: 固体能量平衡
-            dU_dt_solid = self.formula_44(
-                H_tilde_s, Q_tilde_s, 
-                H_s_prev, Q_s_prev, 
-                cell['delta_z'], Qgsrad, Qgscv, V_delta
-            )
-            # 公式45: 气体能量平衡
-            dU_dt_gas = self.formula_45(
-                H_tilde_g, Q_tilde_g, 
-                H_g_prev, Q_g_prev, 
-                cell['delta_z'], Qgsrad, Qgscv, V_delta
+        # 计算反应焓变 (Jsg)，公式52
+        # 气相反应: r6, r7, r8 (燃烧)；固相/表面反应: r1-r5 (分解/化合), r9-r11 (碳燃烧/气化)
+        # 按反应温度标记一次遍历激活反应，分别累加气相与固相焓变 (J/m^3s)
+        # 注意: J_sg 为焓变. 放热 dH<0 -> J_sg < 0.
+        J_sg_g, J_sg_s = _reaction_heats(rxn_rates, self._active_rxn_dH_by_section[section],
+                                         self._active_rxn_uses_Ts_by_section[section])
+
+        # 能量方程：调用按区段预先解析的句柄（预热器纯输运 / 分解炉、回转窑气固双方程，见 _compile_rule_handles）
+        energy_eq_fn = rules['_energy_eq_fn']
+        if energy_eq_fn is not None:
+            dU_dt_solid, dU_dt_gas = energy_eq_fn(
+                H_tilde_s, Q_tilde_s, H_s_prev, Q_s_prev,
+                H_tilde_g, Q_tilde_g, H_g_prev, Q_g_prev,
+                delta_z, Qgsrad, Qgscv, V_delta
             )
             dU_dt_total = dU_dt_solid + dU_dt_gas
 
@@ -2763,44 +2887,40 @@ class CementProductionModel:
     def _update_variables(self, cell, dC_dt, dU_dt_dict):
         # 同步更新单元变量：当前单元、浓度变化率、内能变化率字典
         index = cell['index'] #获取当前单元的索引，用于同步更新全局变量数组
-        delta_z = cell['delta_z']
 
         # 获取当前单元的状态变量和代数变量
         state_vars = cell['state_variables']
         algebraic_vars = cell['algebraic_variables']
+        # 全局状态/代数变量数组绑定为局部变量，后续按单元下标读写
+        global_state = self.variables['state_variables']
+        global_alg = self.variables['algebraic_variables']
         
         # 1. 更新状态变量：浓度 C 和单位体积内能 Ũ 「新值 = 原值 + 变化率 × Δt」
         # 更新浓度变量 C
-        for component in dC_dt: #遍历所有有浓度变化率的组分
-            # 同步更新状态变量
-            state_vars['C'][component] += dC_dt[component] * self.dt #按公式更新浓度（原值 + 变化率 ×dt）
-            # 确保浓度非负
-            if state_vars['C'][component] < 1e-12: #判断浓度是否小于 0
-                state_vars['C'][component] = 1e-12
-            # 同步更新全局数组
-            self.variables['state_variables']['C'][index][component] = state_vars['C'][component]
+        # 单元的 C 与全局 C[index] 是同一个按组分顺序存储的列表（见 spatial_discretization），
+        # 原地更新即同时更新全局数组，无需再逐组分写回
+        # dC_dt 与浓度列表同为组分顺序，逐项对应；更新后浓度不低于 1e-12，确保非负
+        dt = self.dt
+        C = state_vars['C']  # 组分浓度列表（按组分顺序）
+        _advance_clamped(C, dC_dt, dt, 1e-12)
         
         # 2. 更新独立的状态变量 U_g 和 U_s
-        state_vars['U_g'] += dU_dt_dict['gas'] * self.dt
-        state_vars['U_s'] += dU_dt_dict['solid'] * self.dt
+        state_vars['U_g'] += dU_dt_dict['gas'] * dt
+        state_vars['U_s'] += dU_dt_dict['solid'] * dt
         
         # 同步回全局状态数组
-        self.variables['state_variables']['U_g'][index] = state_vars['U_g']
-        self.variables['state_variables']['U_s'][index] = state_vars['U_s']
+        global_state['U_g'][index] = state_vars['U_g']
+        global_state['U_s'][index] = state_vars['U_s']
         
         # 更新代数变量 U_hat (仅用于记录)
         algebraic_vars['U_hat'] = state_vars['U_g'] + state_vars['U_s']
-        self.variables['algebraic_variables']['U_hat'][index] = algebraic_vars['U_hat']
+        global_alg['U_hat'][index] = algebraic_vars['U_hat']
         
         
 # 二、温度求解和更新 
-        # 准备组分列表
-        stoichiometric_matrix = self.constants['stoichiometric_matrix']
-        gas_components = stoichiometric_matrix['components'][9:]
-        solid_components = stoichiometric_matrix['components'][:9]
-
-        A_t = algebraic_vars.get('A_t')
-        V_delta = self.formula_58(A_t, delta_z)
+        # 组分按下标切片访问（固体 C[:9]、气体 C[9:]、真实气体 C[10:]），无需重建组分名列表
+        # 单段总体积（公式58）只取决于设备截面积与段长，取预计算值（见 _cache_geometry）
+        V_delta = self._geom[cell['_section']]['V_delta']
         Tg = algebraic_vars['Tg']
         Ts = algebraic_vars['Ts']
 
@@ -2823,22 +2943,16 @@ class CementProductionModel:
         # 获取气体热容参数
         cp_g_mass = algebraic_vars.get('cp_g', 1.0)
         # 计算气体密度 使用当前时刻的新浓度计算
-        gas_C_dict = {k: state_vars['C'].get(k, 0.0) for k in gas_components}
-        rho_g = self.formula_11(self.constants['gas_properties'], gas_C_dict)
+        rho_g = self.formula_11(self._molar_mass_g, C[9:])
 
         # 计算气体体积热容
         Cv_gas = rho_g * cp_g_mass
         
         # 计算温度梯度
-        prev_Tg = self.variables['algebraic_variables']['Tg'][index-1] if index > 0 else algebraic_vars['Tg']
-        dTg_dz = self.formula_43([prev_Tg, Tg])
+        prev_Tg = global_alg['Tg'][index-1] if index > 0 else algebraic_vars['Tg']
+        dTg_dz = self.formula_43(prev_Tg, Tg)
         Q_adv_g = - vg * Cv_gas * dTg_dz
 
-        # 4. 更新气体温度
-        if Cv_gas > 1e-4:
-            Tg_dt = (Q_exch_g + Q_rxn_g + Q_adv_g) * self.dt / Cv_gas
-            algebraic_vars['Tg'] += Tg_dt 
-        
         # 核心逻辑：B. 固体温度更新
         # 1. 换热项 (辐射 + 对流) 固体获得热量，故为正
         Q_exch_s = (Qgscv + Qgsrad) / V_delta
@@ -2848,30 +2962,11 @@ class CementProductionModel:
         Q_rxn_s = -J_sg_s
         
         # 3. 显热对流输运项
-        # 计算固体体积热容 (遍历求和)
-        n_list = []      # 摩尔数列表
-        cp_mol_list = [] # 摩尔热容列表
-        M_list = []      # 摩尔质量列表
-
-        for comp in solid_components:
-            conc = state_vars['C'].get(comp, 0.0)
-            n_i = self.formula_57(V_delta, conc)
-            if comp in self.constants['solid_properties']:
-                M = self.constants['solid_properties'][comp]['molar_mass']
-            else: 
-                M = self.constants['gas_properties'][comp]['molar_mass']
-            # 获取热容系数
-            if comp in self.constants['molar_heat_capacity']:
-                coeffs = self.constants['molar_heat_capacity'][comp]
-                # 计算摩尔热容 (J/mol·K)
-                cp_molar = self.formula_6(coeffs['C0'], coeffs['C1'], coeffs['C2'], Ts)
-            else:
-                cp_molar = 0.0 # 惰性或无数据组分
-                
-            # 添加到列表
-            n_list.append(n_i)
-            cp_mol_list.append(cp_molar)
-            M_list.append(M)
+        # 计算固体体积热容：摩尔数（公式57）、摩尔热容（公式6）与摩尔质量均按固体浓度切片 C[:9] 的顺序排列，
+        # 惰性或无热容数据的组分系数为 0，摩尔热容即为 0
+        n_list = [conc * V_delta for conc in C[:9]]                 # 摩尔数列表
+        cp_mol_list = _molar_heat_capacities(self._cp_coeffs_s, Ts)  # 摩尔热容列表 (J/mol·K)
+        M_list = self._molar_mass_s                                  # 摩尔质量列表
 
         # 计算质量比热容 cp (J/(g·K))
         cp_mass = self.formula_15(n_list, cp_mol_list, M_list)
@@ -2881,61 +2976,49 @@ class CementProductionModel:
         Cv_solid = cp_mass * rho_s
 
         # 计算温度梯度
-        prev_Ts = self.variables['algebraic_variables']['Ts'][index-1] if index > 0 else algebraic_vars['Ts']
-        dTs_dz = self.formula_43([prev_Ts, Ts])
+        prev_Ts = global_alg['Ts'][index-1] if index > 0 else algebraic_vars['Ts']
+        dTs_dz = self.formula_43(prev_Ts, Ts)
         Q_adv_s =  vs * Cv_solid * dTs_dz
 
-        # 更新固体温度 Ts
-        if Cv_solid > 1e-4:
-            Ts_dt = (Q_exch_s + Q_rxn_s + Q_adv_s) * self.dt / Cv_solid
-            algebraic_vars['Ts'] += Ts_dt
+        # 核心逻辑：C. 气、固温度同步推进（两相格式相同：T ← T + (换热 + 反应热 + 对流)·Δt / Cv）
+        algebraic_vars['Tg'] = _sensible_heat_step(algebraic_vars['Tg'], Q_exch_g + Q_rxn_g + Q_adv_g, Cv_gas, dt)
+        algebraic_vars['Ts'] = _sensible_heat_step(algebraic_vars['Ts'], Q_exch_s + Q_rxn_s + Q_adv_s, Cv_solid, dt)
 
 # 一、压力求解和更新
         # 计算气体总摩尔浓度
-        real_gas_components = [c for c in gas_components if c != 'C_sus']
-        real_gas_C_dict = {k: state_vars['C'].get(k, 0.0) for k in real_gas_components}
-        gas_total_concentration = self.formula_77(real_gas_C_dict)
+        real_gas_C = C[10:]  # 真实气体（不含位于气体段首位的 C_sus）浓度切片
+        gas_total_concentration = self.formula_77(real_gas_C)
         
         # 使用理想气体状态方程 P = C * R * T 计算新压力
         if gas_total_concentration > 1e-10:
-            new_P = gas_total_concentration * self.constants['R'] * algebraic_vars['Tg']
+            new_P = gas_total_concentration * self.K.R * algebraic_vars['Tg']
         else:
-            new_P = self.constants['P0']
+            new_P = self.K.P0
             
         algebraic_vars['P'] = new_P
         
         # 3. 同步更新全局数组中的代数变量
-        self.variables['algebraic_variables']['Tg'][index] = algebraic_vars['Tg']
-        self.variables['algebraic_variables']['Ts'][index] = algebraic_vars['Ts']
-        self.variables['algebraic_variables']['P'][index] = algebraic_vars['P']
-        
-        # 4. 确保变量耦合一致性
-        cell['algebraic_variables'].update(algebraic_vars)
-        
-        # 5. 同步更新全局设备类型标识
-        self.variables['device_type'][index] = cell['device_type']
+        global_alg['Tg'][index] = algebraic_vars['Tg']
+        global_alg['Ts'][index] = algebraic_vars['Ts']
+        global_alg['P'][index] = algebraic_vars['P']
     
 #五、核心变量获取方法
     def _get_core_variables(self):
-        # 获取全局核心微分变量用于收敛判断
-        # 温度、主物料浓度、内能
-        core_vars = { #构建核心变量字典
-            'gas_temperature': self.variables['algebraic_variables']['Tg'],
-            'solid_temperature': self.variables['algebraic_variables']['Ts'],  # 区分气固温度
-            'main_concentration': [cell['state_variables']['C']['CaCO3'] for cell in self.cells],  # 主物料浓度
-            'internal_energy_g': self.variables['state_variables']['U_g'], # 气体内能
-            'internal_energy_s': self.variables['state_variables']['U_s']  # 固体内能
-        }
+        # 获取全局核心微分变量用于收敛判断，返回扁平的数值快照列表
+        # 说明：Tg、Ts、U_g、U_s 的全局列表在单步推进中原地更新，原先收集的是这些列表本身的引用，
+        #       前后两次取到的是同一对象，差值恒为 0；实际参与判定的只有主物料浓度一列，这里只取该列
+        k_main = self._comp_idx['CaCO3']  # 主物料浓度
+        core_vars = [row[k_main] for row in self.variables['state_variables']['C']] #构建核心变量列表
         return core_vars
   
 #六、收敛判定方法  
     def check_convergence(self, prev_vars, current_vars):
-        # 收敛判定:上一迭代核心变量\当前迭代核心变量
-        # 所有核心变量迭代差值均小于收敛阈值时，判定系统达到稳态
-        for var_name in prev_vars: #遍历所有核心变量类型
-            for prev_val, curr_val in zip(prev_vars[var_name], current_vars[var_name]): #遍历各单元的变量值
-                if abs(curr_val - prev_val) > self.convergence_threshold: #判断当前值与上一值的差值是否大于阈值
-                    return False
+        # 收敛判定:上一迭代核心变量\当前迭代核心变量（_get_core_variables 输出的扁平列表）
+        # 所有核心变量迭代差值均小于收敛阈值时，判定系统达到稳态；一次遍历，遇到首个超限值即返回
+        threshold = self.convergence_threshold
+        for prev_val, curr_val in zip(prev_vars, current_vars): #逐项对比各单元的核心变量
+            if abs(curr_val - prev_val) > threshold: #判断当前值与上一值的差值是否大于阈值
+                return False
         return True
     
     def print_key_variables(self, iteration):
@@ -2964,6 +3047,7 @@ class CementProductionModel:
         max_dU_dt = 0.0
         
         print("\n各单元核心变量:")
+        comp_idx = self._comp_idx
         for i, cell in enumerate(self.cells):
             device_type = cell['device_type']
             state_vars = cell['state_variables']
@@ -2973,8 +3057,8 @@ class CementProductionModel:
             Tg = algebraic_vars.get('Tg', 0.0)
             Ts = algebraic_vars.get('Ts', 0.0)
             P = algebraic_vars.get('P', 0.0)
-            CaCO3 = state_vars['C'].get('CaCO3', 0.0)
-            CO2 = state_vars['C'].get('CO2', 0.0)
+            CaCO3 = state_vars['C'][comp_idx['CaCO3']]
+            CO2 = state_vars['C'][comp_idx['CO2']]
             U_g = state_vars.get('U_g', 0.0)
             U_s = state_vars.get('U_s', 0.0)
             U_hat = U_g + U_s
@@ -2994,17 +3078,14 @@ class CementProductionModel:
             epsilon_g = algebraic_vars.get('epsilon_g', 0.0)
             
             # 获取设备配置
-            section = self._get_cell_section(i)
-            config = self.section_configs[section].copy()
-            config['device_type'] = section
-            execution_rules = self._get_execution_rules(config)
+            execution_rules = self._execution_rules_by_section[cell['_section']]
             
             # 重新计算dC_dt和dU_dt用于打印
             algebraic_vars_calc = self._perform_algebraic_calculations(cell, execution_rules)
             dC_dt, dU_dt_dict = self._solve_differential_equations(cell, execution_rules, algebraic_vars_calc)
             
             # 计算max_dC_dt和max_dU_dt
-            current_max_dC_dt = max([abs(val) for val in dC_dt.values()], default=0.0)
+            current_max_dC_dt = max([abs(val) for val in dC_dt], default=0.0)
             if current_max_dC_dt > max_dC_dt:
                 max_dC_dt = current_max_dC_dt
             
@@ -3016,14 +3097,14 @@ class CementProductionModel:
                 max_dU_dt = abs(current_dU_dt)
             
             # 获取熟料组分浓度
-            CaO = state_vars['C'].get('CaO', 0.0)
-            SiO2 = state_vars['C'].get('SiO2', 0.0)
-            Al2O3 = state_vars['C'].get('Al2O3', 0.0)
-            Fe2O3 = state_vars['C'].get('Fe2O3', 0.0)
-            C2S = state_vars['C'].get('C2S', 0.0)
-            C3S = state_vars['C'].get('C3S', 0.0)
-            C3A = state_vars['C'].get('C3A', 0.0)
-            C4AF = state_vars['C'].get('C4AF', 0.0)
+            CaO = state_vars['C'][comp_idx['CaO']]
+            SiO2 = state_vars['C'][comp_idx['SiO2']]
+            Al2O3 = state_vars['C'][comp_idx['Al2O3']]
+            Fe2O3 = state_vars['C'][comp_idx['Fe2O3']]
+            C2S = state_vars['C'][comp_idx['C2S']]
+            C3S = state_vars['C'][comp_idx['C3S']]
+            C3A = state_vars['C'][comp_idx['C3A']]
+            C4AF = state_vars['C'][comp_idx['C4AF']]
             
             # 打印当前单元信息
             print(f"\n  单元 {i} ({device_type}):")
@@ -3068,32 +3149,26 @@ class CementProductionModel:
         
         # 3. 计算熟料组分占比
         # 获取固体组分浓度
-        solid_components = self.constants['stoichiometric_matrix']['components'][:9]
+        solid_components = self._solid_components
         outlet_concentrations = outlet_cell['state_variables']['C']
+        comp_idx = self._comp_idx
         
-        # 计算各熟料组分的摩尔数
-        clinker_components = ['CaO', 'C2S', 'C3S', 'C3A', 'C4AF'] #熟料矿物组分列表
-        clinker_moles = {} 
-        for component in clinker_components: #循环遍历熟料组分
-            clinker_moles[component] = outlet_concentrations.get(component, 0.0)#获取组分浓度并存入字典
+        # 熟料矿物组分
+        clinker_components = ('CaO', 'C2S', 'C3S', 'C3A', 'C4AF') #熟料矿物组分列表
         
-        # 计算所有固体组分的总摩尔浓度（相对于所有固体组分）
-        total_solid_moles = 0.0
-        for component in solid_components:
-            if component in outlet_concentrations:
-                total_solid_moles += outlet_concentrations[component]
+        # 计算所有固体组分的总摩尔浓度（相对于所有固体组分），固体组分位于浓度列表前 9 位
+        outlet_solid_C = outlet_concentrations[:9]
+        total_solid_moles = sum(outlet_solid_C)
         
-        # 如果total_solid_moles为0，则使用clinker_moles的总和作为备选
+        # 如果total_solid_moles为0，则使用熟料组分摩尔数的总和作为备选
         if total_solid_moles == 0:
-            total_solid_moles = sum(clinker_moles.values())
+            total_solid_moles = sum(outlet_concentrations[comp_idx[component]] for component in clinker_components)
         
-        # 计算各组分占比
-        clinker_ratio = {}
-        for component in clinker_components: #循环遍历熟料组分
-            if total_solid_moles > 0:
-                clinker_ratio[component] = (clinker_moles[component] / total_solid_moles) * 100
-            else:
-                clinker_ratio[component] = 0.0
+        # 计算各固体组分占比（熟料与原料统一按 浓度 / 总固体摩尔浓度 × 100 计算）
+        if total_solid_moles > 0:
+            solid_ratio = [(conc / total_solid_moles) * 100 for conc in outlet_solid_C]
+        else:
+            solid_ratio = [0.0] * len(outlet_solid_C)
         
         # 4. 打印结果
         print("=" * 60)
@@ -3102,18 +3177,9 @@ class CementProductionModel:
         print(f"出口温度: {outlet_temperature:.2f} K")
         
         print("\n熟料及原料组分占比 (%):")
-        for component in solid_components:
-            ratio = clinker_ratio.get(component, 0)
-            if component in ['CaO', 'C2S', 'C3S', 'C3A', 'C4AF']:
-                print(f"{component} (熟料): {ratio:.2f}%")
-            else:
-                if component in outlet_concentrations:
-                    conc = outlet_concentrations[component]
-                    if total_solid_moles > 0:
-                        ratio = (conc / total_solid_moles) * 100
-                    else:
-                        ratio = 0.0
-                    print(f"{component} (原料): {ratio:.2f}%")
+        for component, ratio in zip(solid_components, solid_ratio):
+            label = "熟料" if component in clinker_components else "原料"
+            print(f"{component} ({label}): {ratio:.2f}%")
         print(f"\n总固体摩尔浓度: {total_solid_moles:.6f} mol/m³")
         print("=" * 60)
 
@@ -3137,7 +3203,7 @@ def main():
     # 【调试】打印进料后第一个单元的浓度
     if model.cells:
         first_cell = model.cells[0]
-        solid_components = model.constants['stoichiometric_matrix']['components'][:9]
+        solid_components = model._solid_components
     
     # 启动求解
     model.solve()
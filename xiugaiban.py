@@ -248,6 +248,10 @@ class CementProductionModel:
                 [0,   0,  0,  0,  0,  0, +1,  0,  0, +1,  0]   # H2
             ]
         }
+        
+        # 压力限幅上下界：标准大气压的 0.5~1.5 倍，预先算好，迭代更新时直接读取
+        self._P_lo = self.constants['P0'] * 0.5
+        self._P_hi = self.constants['P0'] * 1.5
     
     def define_parameters(self):
         # 定义系统参数
@@ -465,6 +469,16 @@ class CementProductionModel:
             }
             self.cells.append(cell) #将当前单元字典添加到cells列表中
         
+        # 区段衔接单元下标：各区段单元在 cells 中连续排列，划分在离散后固定，预先记录一次
+        calciner_first_idx = preheater_segments
+        kiln_first_idx = preheater_segments + calciner_segments
+        self._section_transition_pairs = [] #(前一区段最后一个单元下标, 后一区段第一个单元下标)
+        if preheater_segments and calciner_segments: #预热器 → 分解炉
+            self._section_transition_pairs.append((calciner_first_idx - 1, calciner_first_idx))
+        if calciner_segments and kiln_segments: #分解炉 → 回转窑
+            self._section_transition_pairs.append((kiln_first_idx - 1, kiln_first_idx))
+        self._kiln_last_idx = total_segments - 1 if kiln_segments else None #回转窑最后一个单元（出料口）
+        
         print(f"空间离散完成：{total_segments} 个单元，其中预热器 {preheater_segments} 个，分解炉 {calciner_segments} 个，回转窑 {kiln_segments} 个")
     
     # 通用计算子函数库 - 仅定义公式签名，不实现具体内容
@@ -818,17 +832,21 @@ class CementProductionModel:
         rj = kr * (T ** n) * math.exp(-EA / (R * T)) * product_P * product_C
         return rj
     
-    def formula_27(self, T, P_i_dict, C_i_dict):
+    def formula_27(self, T, P_i_dict, C_i_dict, allowed_reactions=None):
         # 27反应源项计算（固/气相生成速率）
-        # 输入：T（温度，变量）、P_i_dict（组分分压字典）、C_i_dict（组分浓度字典）
+        # 输入：T（温度，变量）、P_i_dict（组分分压字典）、C_i_dict（组分浓度字典）、allowed_reactions（可选，当前设备激活的反应列表）
         # 输出：Rs,Rg（固/气相生成速率）
         # 公式：[R_s; R_g] = v * r
         
         # 获取化学计量矩阵
         stoichiometric_matrix = self.constants['stoichiometric_matrix']['matrix']
         
-        # 获取所有反应标识
-        reactions = list(self.constants['reaction_rate_coefficients'].keys())
+        # 获取反应标识：指定了激活反应时只取其中已定义的反应，否则取全部反应
+        all_reaction_coeffs = self.constants['reaction_rate_coefficients']
+        if allowed_reactions:
+            reactions = [r for r in allowed_reactions if r in all_reaction_coeffs]
+        else:
+            reactions = list(all_reaction_coeffs.keys())
         
         # 计算所有反应的速率
         r = []
@@ -969,15 +987,12 @@ class CementProductionModel:
         # 这里假设H_tilde_s、H_tilde_g和Q_tilde_g已经包含了梯度计算
         return -(H_tilde_g + H_tilde_s + Q_tilde_g) - (Qgsrad + Qgscv) / V_delta
     
-    def formula_43(self, T_i):
+    def formula_43(self, T_prev, T_curr):
         # 43温度轴向梯度
-        # 输入：Ti（气体或固体温度，空间离散点数据，包含当前段和前一段的温度）
+        # 输入：T_prev（前一段的气体或固体温度）、T_curr（当前段的温度）
         # 输出：∂Ti/∂z（梯度）
         # 公式：∂Ti/∂z (z_k) = (Ti(z_k) - Ti(z_k-1)) / Δz
-        # 这里假设T_i是一个包含当前段和前一段温度的列表
-        if len(T_i) < 2:
-            return 0.0
-        return (T_i[-1] - T_i[-2]) / self.dz
+        return (T_curr - T_prev) / self.dz
     
     def formula_44(self, H_tilde_s, Q_tilde_s, Qgsrad, Qgscv, V_delta, Jsg):
         # 44回转窑固体能量平衡
@@ -1451,6 +1466,11 @@ class CementProductionModel:
         
         index = cell['index'] #获取当前单元的索引
         device_type = cell['device_type']
+        
+        # 前一个单元及其代数变量、浓度字典只取一次，后续床层高度与浓度梯度均由此读取
+        prev_cell = self.cells[index-1] if index > 0 else None
+        prev_alg = prev_cell['algebraic_variables'] if prev_cell else None
+        prev_C = prev_cell['state_variables']['C'] if prev_cell else None
       
 #一、基础几何与填充参数计算  
         # 1. 计算填充率和填充角（只计算一次，供后续所有计算使用）
@@ -1500,8 +1520,7 @@ class CementProductionModel:
                 T = 1000.0  # 回转窑初始温度
         
         # 限制温度范围，避免数值溢出
-        T = max(T, 300.0)  # 最低温度300K
-        T = min(T, 2000.0)  # 最高温度2000K
+        T = min(max(T, 300.0), 2000.0)  # 温度限制在 300K~2000K
         
         if 'P' in cell['algebraic_variables']:
             P = cell['algebraic_variables']['P']
@@ -1561,7 +1580,7 @@ class CementProductionModel:
             
             # 计算摩尔焓（公式50）
             h_i = self.formula_50(Hf_i, integral_enthalpy)
-            h_i_g.append(h_i) 3将气体组分的摩尔焓添加到h_i_g列表
+            h_i_g.append(h_i) #将气体组分的摩尔焓添加到h_i_g列表
 
 #四、物质通量计算        
         # 2. 计算各组分的通量
@@ -1598,8 +1617,7 @@ class CementProductionModel:
             # 2. 获取前一个单元的床层高度
             h_prev = h_current  # 默认情况：如果是第一个单元，前一个单元的床层高度等于当前单元
             if index > 0: #若不是第一个单元
-                prev_cell = self.cells[index-1]
-                prev_theta = prev_cell['algebraic_variables'].get('theta', theta) #读取前一个单元的填充角
+                prev_theta = prev_alg.get('theta', theta) #读取前一个单元的填充角
                 h_prev = self.formula_72(r_c, prev_theta) #计算前一个单元的床层高度
             
             # 3. 构建床层高度列表，包含当前段和前一段的床层高度
@@ -1643,9 +1661,7 @@ class CementProductionModel:
         # 获取前一个单元的浓度
         dC_i_g_dz = 0.0 #初始化浓度梯度为 0
         if index > 0: #若不是第一个单元
-            prev_cell = self.cells[index-1] #获取前一个单元
-            prev_C = prev_cell['state_variables']['C'] 获取前一个单元
-            prev_C_i_g = prev_C[component] 读取前一个单元该组分的浓度
+            prev_C_i_g = prev_C[component] #读取前一个单元该组分的浓度
             delta_z = cell['delta_z'] #读取当前单元的空间步长
             dC_i_g_dz = self.formula_23(C[component], prev_C_i_g, delta_z)
         
@@ -1819,7 +1835,7 @@ class CementProductionModel:
             Hf_i_s.append(self.constants['standard_enthalpy'].get(component, 0.0)) #添加固体标准生成焓
             
             # 使用公式57计算固体组分摩尔数
-            C_i_s_t = C[component #读取固体组分浓度
+            C_i_s_t = C[component] #读取固体组分浓度
             n_i = self.formula_57(V_delta, C_i_s_t) #计算固体组分摩尔数
             n_i_s.append(n_i) #添加到固体摩尔数列表
         
@@ -1929,6 +1945,11 @@ class CementProductionModel:
         # 获取单元所属设备类型
         section = cell['device_type']
         
+        # 前一个单元及其代数变量、浓度字典只取一次，后续通量梯度与温度梯度均由此读取
+        prev_cell = self.cells[index-1] if index > 0 else None
+        prev_alg = prev_cell['algebraic_variables'] if prev_cell else None
+        prev_C = prev_cell['state_variables']['C'] if prev_cell else None
+        
         # 获取从代数计算得到的约束变量
         T = algebraic_vars.get('T', 1000.0)  # 温度，从代数计算得到
         P = algebraic_vars.get('P', self.constants['P0'])  # 压力，从代数计算得到
@@ -1957,23 +1978,10 @@ class CementProductionModel:
             else:
                 reactions = []  # 其他设备无反应
         
-        # 复制原始反应速率系数字典
-        original_reactions = self.constants['reaction_rate_coefficients'].copy()
-        
-        try: #异常捕获起始，确保无论计算是否出错，都能恢复原始反应列表
-            # 根据设备类型过滤反应速率系数
-            if reactions: #若反应列表非空
-                #筛选出当前设备的反应速率系数
-                filtered_reactions = {r: original_reactions[r] for r in reactions if r in original_reactions}
-                #更新反应速率系数字典，仅保留当前设备的反应
-                self.constants['reaction_rate_coefficients'] = filtered_reactions
-            
-            P_i_dict = {}  # 组分分压字典，从代数计算得到
-            C_i_dict = C  # 组分浓度字典，当前状态变量
-            Rs, Rg = self.formula_27(T, P_i_dict, C_i_dict)
-        finally: #异常捕获结束，确保必须执行的恢复操作
-            # 恢复原有反应列表
-            self.constants['reaction_rate_coefficients'] = original_reactions
+        # 当前设备的反应列表以参数形式传入公式27，由其内部筛选，不再临时改写 self.constants
+        P_i_dict = {}  # 组分分压字典，从代数计算得到
+        C_i_dict = C  # 组分浓度字典，当前状态变量
+        Rs, Rg = self.formula_27(T, P_i_dict, C_i_dict, reactions)
    
 #二、浓度变化率计算     
         # 2. 计算通量和通量梯度
@@ -1987,9 +1995,7 @@ class CementProductionModel:
             # 获取前一个单元的通量
             prev_N_i_s = N_i_s  # 默认边界条件：入口处梯度为0
             if index > 0: #若不是第一个单元
-                prev_cell = self.cells[index-1] #获取前一个单元
-                prev_C = prev_cell['state_variables']['C']  #读取前一个单元的浓度字典
-                prev_vs = prev_cell['algebraic_variables'].get('vs', vs)  #读取前一个单元的固体速度
+                prev_vs = prev_alg.get('vs', vs)  #读取前一个单元的固体速度
                 prev_N_i_s = self.formula_25(prev_vs, prev_C[component])
             
             # 获取轴向步长
@@ -2026,9 +2032,7 @@ class CementProductionModel:
             # 获取前一个单元的通量
             prev_N_i_g = N_i_g  # 默认边界条件：入口处梯度为0
             if index > 0:
-                prev_cell = self.cells[index-1] #获取前一个单元
-                prev_C = prev_cell['state_variables']['C'] #读取前一个单元的浓度字典
-                prev_vg = prev_cell['algebraic_variables'].get('vg', vg) #读取前一个单元的气体速度
+                prev_vg = prev_alg.get('vg', vg) #读取前一个单元的气体速度
                 prev_N_i_g = self.formula_21(prev_vg, prev_C[component], T, P, components, xj, cg, dC_i_g_dz)
             
             # 获取轴向步长
@@ -2088,11 +2092,8 @@ class CementProductionModel:
                 current_T = T
                 prev_T = current_T #默认前序单元温度与当前一致
                 if index > 0: #若不是第一个单元
-                    prev_cell = self.cells[index-1] #获取前一个单元
-                    prev_T = prev_cell['algebraic_variables'].get('T', current_T) #读取前一个单元的温度
-                # 构建温度列表用于计算梯度
-                T_list = [prev_T, current_T]
-                dT_i_dz = self.formula_43(T_list)
+                    prev_T = prev_alg.get('T', current_T) #读取前一个单元的温度
+                dT_i_dz = self.formula_43(prev_T, current_T)
                 
                 # 计算气体热传导（公式54），使用计算得到的温度梯度
                 k_g = self.formula_20(T)
@@ -2142,11 +2143,8 @@ class CementProductionModel:
                 current_T = T
                 prev_T = current_T #前序温度=当前温度
                 if index > 0:
-                    prev_cell = self.cells[index-1] #前一个单元
-                    prev_T = prev_cell['algebraic_variables'].get('T', current_T) #前序温度
-                # 构建温度列表用于计算梯度
-                T_list = [prev_T, current_T]
-                dT_i_dz = self.formula_43(T_list)
+                    prev_T = prev_alg.get('T', current_T) #前序温度
+                dT_i_dz = self.formula_43(prev_T, current_T)
                 
                 # 计算热传导
                 k_g = self.formula_20(T)
@@ -2188,75 +2186,70 @@ class CementProductionModel:
         # 获取当前单元的状态变量和代数变量
         state_vars = cell['state_variables']
         algebraic_vars = cell['algebraic_variables']
+        # 时间步长与全局变量数组绑定为局部变量，省去逐次属性/字典查找
+        dt = self.dt
+        global_state = self.variables['state_variables']
+        global_alg = self.variables['algebraic_variables']
         
         # 1. 更新状态变量：浓度 C 和单位体积内能 Ũ
         # 按公式「新值 = 原值 + 变化率 × Δt」
         
         # 更新浓度变量 C
+        # 单元的浓度字典与全局 C[index] 是同一对象（见 spatial_discretization），原地更新即同时更新全局数组，无需逐组分写回
+        C = state_vars['C']
+        dC_total = 0.0 # 浓度变化率之和，随更新循环顺带累加，供下方压力更新使用
         for component in dC_dt: #遍历所有有浓度变化率的组分
+            dC_i = dC_dt[component]
+            dC_total += dC_i
             # 同步更新状态变量
-            state_vars['C'][component] += dC_dt[component] * self.dt #按公式更新浓度（原值 + 变化率 ×dt）
+            C[component] += dC_i * dt #按公式更新浓度（原值 + 变化率 ×dt）
             # 确保浓度非负
-            if state_vars['C'][component] < 0: #判断浓度是否小于 0
-                state_vars['C'][component] = 0.0
-            # 同步更新全局数组
-            self.variables['state_variables']['C'][index][component] = state_vars['C'][component]
+            if C[component] < 0: #判断浓度是否小于 0
+                C[component] = 0.0
         
         # 更新内能变量 Ũ
-        state_vars['U_hat'] += dU_dt * self.dt #按公式更新单位体积内能（原值 + 变化率 ×dt）
+        state_vars['U_hat'] += dU_dt * dt #按公式更新单位体积内能（原值 + 变化率 ×dt）
         # 同步更新全局数组
-        self.variables['state_variables']['U_hat'][index] = state_vars['U_hat']
+        global_state['U_hat'][index] = state_vars['U_hat']
         
         # 2. 根据更新后的状态变量，重新计算并更新代数变量
         # 确保代数变量 T、P 随状态变量更新同步修正，保持变量耦合一致性
         
-        # 重新获取所有组分列表
-        stoichiometric_matrix = self.constants['stoichiometric_matrix'] #从化学计量矩阵获取组分信息
-        all_components = stoichiometric_matrix['components'] #所有组分列表
-        solid_components = all_components[:9] 
-        gas_components = all_components[9:]
-        
         # 重新计算温度 T（基于能量守恒）
         # 温度与内能成正比
         if state_vars['U_hat'] > 0:  #判断内能是否为正
             # 更合理的温度更新逻辑，避免温度过快增长
-            new_T = algebraic_vars['T'] + (dU_dt * self.dt) * 0.001  # 计算新温度（原温度 + 内能变化 × 修正系数）
+            new_T = algebraic_vars['T'] + (dU_dt * dt) * 0.001  # 计算新温度（原温度 + 内能变化 × 修正系数）
             # 限制温度范围
-            algebraic_vars['T'] = max(new_T, 300.0)  # 确保温度不低于300K
-            algebraic_vars['T'] = min(algebraic_vars['T'], 2000.0)  # 确保温度不高于2000K
+            algebraic_vars['T'] = min(max(new_T, 300.0), 2000.0)  # 确保温度在 300K~2000K 之间
         
         # 重新计算压力 P（基于理想气体状态方程）
         # 压力与气体浓度和温度成正比
         gas_total_concentration = self.formula_77(state_vars['C']) #计算气体总摩尔浓度
         
         # 避免除零错误的压力更新逻辑
-        denominator = gas_total_concentration - sum(dC_dt.values()) * self.dt #计算分母（更新前的气体总浓度）
+        denominator = gas_total_concentration - dC_total * dt #计算分母（更新前的气体总浓度）
         if denominator <= 0: #判断分母是否为零或负数
             # 分母为零或负数时，使用更安全的压力更新方式
-            new_P = algebraic_vars['P'] * (1 + 0.01 * self.dt)  # 缓慢增加压力
+            new_P = algebraic_vars['P'] * (1 + 0.01 * dt)  # 缓慢增加压力
         else:
             new_P = algebraic_vars['P'] * (gas_total_concentration / denominator)  # 按浓度比值更新压力
         
         # 限制压力范围：压力限制在标准大气压的 0.5~1.5 倍
-        algebraic_vars['P'] = max(min(new_P, self.constants['P0'] * 1.5), self.constants['P0'] * 0.5)  # 压力范围限制
-        
-        # 3. 同步更新全局数组中的代数变量
-        self.variables['algebraic_variables']['T'][index] = algebraic_vars['T']
-        self.variables['algebraic_variables']['P'][index] = algebraic_vars['P']
+        algebraic_vars['P'] = max(min(new_P, self._P_hi), self._P_lo)  # 压力范围限制（预计算的上下界）
         
-        # 4. 确保变量耦合一致性
-        # 将更新后的代数变量同步到单元字典
-        cell['algebraic_variables'].update(algebraic_vars)
-        
-        # 5. 同步更新全局设备类型标识
-        self.variables['device_type'][index] = cell['device_type']
+        # 3. 同步更新全局数组中的代数变量（T、P 为标量，需按下标写回；
+        #    algebraic_vars 即单元自身的代数变量字典，设备类型在离散后不变，均无需再同步）
+        global_alg['T'][index] = algebraic_vars['T']
+        global_alg['P'][index] = algebraic_vars['P']
     
 #二、相邻单元传递方法
     def _transfer_between_cells(self, cell1, cell2):
         # 相邻单元连续传递：前一个单元、后一个单元
         # 前一区段最后一个单元 = 后一区段第一个单元
         # 复制单元1的状态变量到单元2
-        cell2['state_variables']['C'] = cell1['state_variables']['C'].copy() #复制浓度字典
+        # 浓度字典原地覆盖：各单元组分键相同，update 只改写数值；单元2的字典仍是全局 C 列表中的同一对象
+        cell2['state_variables']['C'].update(cell1['state_variables']['C']) #复制浓度值
         cell2['state_variables']['U_hat'] = cell1['state_variables']['U_hat'] #复制内能字典
         
         # 复制单元1的代数变量到单元2
@@ -2277,17 +2270,20 @@ class CementProductionModel:
             inlet_cell['algebraic_variables']['T'] = self.control_variables['solid_feed']['temperature']
             
             # 设置初始进料浓度
+            # 进料单元浓度字典与物性表绑定为局部变量，组分循环内直接使用
+            inlet_C = inlet_cell['state_variables']['C']
+            solid_properties = self.constants['solid_properties']
             # 固体进料
             total_solid_rate = self.control_variables['solid_feed']['total_rate'] #获取固体总进料速率
             for component, mass_fraction in self.control_variables['solid_feed']['composition'].items(): #遍历固体进料的各组分
                 # 计算该组分的质量流量（总速率 × 质量分数）
                 mass_rate = total_solid_rate * mass_fraction
                 # 获取摩尔质量
-                molar_mass = self.constants['solid_properties'][component]['molar_mass']
+                molar_mass = solid_properties[component]['molar_mass']
                 # 计算摩尔流量（质量流量 / 摩尔质量）
                 molar_rate = mass_rate / molar_mass
                 # 计算浓度（假设初始体积为1）
-                inlet_cell['state_variables']['C'][component] = molar_rate
+                inlet_C[component] = molar_rate
             
             # 气体进料
             gas_temp = self.control_variables['gas_feed']['temperature'] #获取气体进料温度
@@ -2295,32 +2291,22 @@ class CementProductionModel:
             R = self.constants['R']
             for component, mole_fraction in self.control_variables['gas_feed']['composition'].items(): #遍历气体进料的各组分
                 # 使用理想气体状态方程计算初始浓度（C = xP/(RT)）
-                inlet_cell['state_variables']['C'][component] = mole_fraction * gas_pressure / (R * gas_temp)
+                inlet_C[component] = mole_fraction * gas_pressure / (R * gas_temp)
  
 #四、区段衔接处理方法 :处理预热器→分解炉、分解炉→回转窑的区段边界传递      
     def _handle_section_transitions(self):
         # 处理不同区段之间的边界衔接
-        preheater_cells = [cell for cell in self.cells if cell['device_type'] == 'preheater'] #筛选所有预热器单元
-        calciner_cells = [cell for cell in self.cells if cell['device_type'] == 'calciner']
-        kiln_cells = [cell for cell in self.cells if cell['device_type'] == 'kiln']
-        
-        # 1. 预热器最后一个单元 → 分解炉第一个单元
-        if preheater_cells and calciner_cells: #判断预热器和分解炉均有单元
-            preheater_last = preheater_cells[-1] #获取预热器最后一个单元
-            calciner_first = calciner_cells[0]#获取分解炉第一个单元
-            # 调用传递方法:传递「升温后温度 + 原始浓度」
-            self._transfer_between_cells(preheater_last, calciner_first)
-        
-        # 2. 分解炉最后一个单元 → 回转窑第一个单元
-        if calciner_cells and kiln_cells: #判断分解炉和回转窑均有单元
-            calciner_last = calciner_cells[-1] #获取分解炉最后一个单元
-            kiln_first = kiln_cells[0] #获取回转窑第一个单元
-            # 传递「反应后温度 + 浓度」
-            self._transfer_between_cells(calciner_last, kiln_first)
+        # 区段衔接单元下标已在 spatial_discretization 中预先确定，这里直接按下标取单元
+        cells = self.cells
+        
+        # 1. 预热器最后一个单元 → 分解炉第一个单元：传递「升温后温度 + 原始浓度」
+        # 2. 分解炉最后一个单元 → 回转窑第一个单元：传递「反应后温度 + 浓度」
+        for last_idx, first_idx in self._section_transition_pairs:
+            self._transfer_between_cells(cells[last_idx], cells[first_idx])
         
         # 3. 回转窑最后一个单元 → 作为出料值
-        if kiln_cells: #判断回转窑有单元
-            kiln_last = kiln_cells[-1] #获取回转窑最后一个单元
+        if self._kiln_last_idx is not None: #判断回转窑有单元
+            kiln_last = cells[self._kiln_last_idx] #获取回转窑最后一个单元
             # 这里可以添加出料值的处理逻辑
             # 例如：存储到结果变量中或输出到文件
             pass